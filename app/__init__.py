@@ -1 +1,21 @@
-# ScriptFlow Application Package
\ No newline at end of file
+# ScriptFlow Application Package
+
+def prepare_database():
+    """
+    Bring the database up to date before the app serves requests
+    
+    Run once per deployment inside an app context, after db.create_all and
+    before any worker starts: it alters the schema and fails executions
+    whose process is gone, which is only safe while no worker is running.
+    """
+    from app.models.migrations import upgrade_database
+    from app.models.schedule import Schedule
+    from app.services.script_executor import script_executor
+    
+    upgrade_database()
+    
+    # Runs missed while the app was down left next_execution in the past
+    Schedule.recompute_all_next_executions()
+    
+    # Executions still RUNNING from a worker that exited without finishing them
+    script_executor.sweep_orphaned_executions()
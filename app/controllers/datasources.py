@@ -221,6 +221,10 @@ def init_datasources_blueprint(app, db, DataSource, apply_user_data_filter):
             datasource.updated_at = datetime.utcnow()
             db.session.commit()
             
+            # Rebuild the pool with the new settings on next use
+            from app.services.connection_manager import connection_manager
+            connection_manager.invalidate(datasource_id)
+            
             flash(f'Data source "{datasource.name}" updated successfully', 'success')
             return redirect(url_for('datasources.view_datasource', datasource_id=datasource_id))
             
@@ -349,6 +353,10 @@ def init_datasources_blueprint(app, db, DataSource, apply_user_data_filter):
             datasource.updated_at = datetime.utcnow()
             db.session.commit()
             
+            # Close its pool so inactive datasources hold no connections
+            from app.services.connection_manager import connection_manager
+            connection_manager.invalidate(datasource_id)
+            
             flash(f'Data source "{datasource_name}" deleted successfully', 'success')
             return redirect(url_for('datasources.list_datasources'))
             
@@ -251,10 +251,14 @@ def init_scripts_blueprint(app, db, Script, Execution, Settings, apply_user_data
             return redirect(url_for('scripts.list_scripts'))
         
         try:
+            # Conditional so repeat downloads revalidate to a bodyless 304; honours
+            # Range requests and USE_X_SENDFILE handoff to the front-end server
             return send_file(
                 script.file_path,
                 as_attachment=True,
-                download_name=f"{script.name}.{script.script_type}"
+                download_name=f"{script.name}.{script.script_type}",
+                conditional=True,
+                max_age=0
             )
         except Exception as e:
             flash(f'Error downloading script: {str(e)}', 'error')
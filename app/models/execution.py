@@ -3,6 +3,7 @@ Execution Model - Script execution tracking and logging
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, inspect, literal_column, or_, text
 from datetime import datetime
 from enum import Enum
 
@@ -17,6 +18,34 @@ class ExecutionStatus(Enum):
     FAILED = 'failed'
     TIMEOUT = 'timeout'
     CANCELLED = 'cancelled'
+    
+    @property
+    def is_finished(self):
+        """Check if an execution in this status has ended (success or failure)"""
+        return self in FINISHED_STATUSES
+
+FINISHED_STATUSES = frozenset({
+    ExecutionStatus.COMPLETED,
+    ExecutionStatus.FAILED,
+    ExecutionStatus.TIMEOUT,
+    ExecutionStatus.CANCELLED
+})
+
+def format_duration(seconds):
+    """Human-readable duration for a number of seconds"""
+    if not seconds:
+        return "N/A"
+    
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    elif seconds < 3600:
+        minutes = int(seconds // 60)
+        seconds = int(seconds % 60)
+        return f"{minutes}m {seconds}s"
+    else:
+        hours = int(seconds // 3600)
+        minutes = int((seconds % 3600) // 60)
+        return f"{hours}h {minutes}m"
 
 class ExecutionTrigger(Enum):
     """Execution trigger type enumeration"""
@@ -24,6 +53,45 @@ class ExecutionTrigger(Enum):
     SCHEDULED = 'scheduled'
     API = 'api'
 
+# Output search indexes: a trigger-maintained tsvector column with a GIN index
+# on PostgreSQL, an FTS5 trigram mirror kept in sync by triggers on SQLite.
+# Neither is mapped on the model so create_all stays portable.
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE executions ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_exec_search_vector ON executions USING gin (search_vector)",
+    "DROP TRIGGER IF EXISTS executions_search_vector_update ON executions",
+    "CREATE TRIGGER executions_search_vector_update BEFORE INSERT OR UPDATE OF stdout, stderr "
+    "ON executions FOR EACH ROW EXECUTE FUNCTION "
+    "tsvector_update_trigger(search_vector, 'pg_catalog.simple', stdout, stderr)",
+    "UPDATE executions SET search_vector = to_tsvector('pg_catalog.simple', "
+    "coalesce(stdout, '') || ' ' || coalesce(stderr, '')) WHERE search_vector IS NULL",
+    "DROP INDEX IF EXISTS ix_exec_stdout_trgm",
+    "DROP INDEX IF EXISTS ix_exec_stderr_trgm",
+]
+
+SEARCH_INDEX_PROBES = {
+    'postgresql': "SELECT 1 FROM information_schema.columns "
+                  "WHERE table_name = 'executions' AND column_name = 'search_vector'",
+    'sqlite': "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'executions_fts'",
+}
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS executions_fts USING fts5("
+    "stdout, stderr, content='executions', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS executions_fts_ai AFTER INSERT ON executions BEGIN "
+    "INSERT INTO executions_fts(rowid, stdout, stderr) VALUES (new.id, new.stdout, new.stderr); END",
+    "CREATE TRIGGER IF NOT EXISTS executions_fts_ad AFTER DELETE ON executions BEGIN "
+    "INSERT INTO executions_fts(executions_fts, rowid, stdout, stderr) "
+    "VALUES ('delete', old.id, old.stdout, old.stderr); END",
+    "CREATE TRIGGER IF NOT EXISTS executions_fts_au AFTER UPDATE OF stdout, stderr ON executions BEGIN "
+    "INSERT INTO executions_fts(executions_fts, rowid, stdout, stderr) "
+    "VALUES ('delete', old.id, old.stdout, old.stderr); "
+    "INSERT INTO executions_fts(rowid, stdout, stderr) VALUES (new.id, new.stdout, new.stderr); END",
+    "INSERT INTO executions_fts(executions_fts) VALUES ('rebuild')",
+]
+
+_search_index_available = None
+
 class Execution(db.Model):
     """Execution model for tracking script runs and their results"""
     
@@ -32,9 +100,14 @@ class Execution(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     started_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     completed_at = db.Column(db.DateTime)
-    status = db.Column(db.Enum(ExecutionStatus), default=ExecutionStatus.PENDING, nullable=False)
+    # active_history loads the committed value before an expired instance is
+    # changed, so the counter events below always see the old status/exit code
+    status = db.column_property(
+        db.Column(db.Enum(ExecutionStatus), default=ExecutionStatus.PENDING, nullable=False),
+        active_history=True
+    )
     trigger_type = db.Column(db.Enum(ExecutionTrigger), default=ExecutionTrigger.MANUAL, nullable=False)
-    exit_code = db.Column(db.Integer)
+    exit_code = db.column_property(db.Column(db.Integer), active_history=True)
     stdout = db.Column(db.Text)
     stderr = db.Column(db.Text)
     duration_seconds = db.Column(db.Float)
@@ -45,12 +118,90 @@ class Execution(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     schedule_id = db.Column(db.Integer, db.ForeignKey('schedules.id'))  # Only for scheduled executions
     
+    # Composite indexes for the per-user listings (keyset on started_at, id),
+    # per-script success aggregates and per-script time-window stats; the
+    # partial index covers the duration averages of finished executions
+    __table_args__ = (
+        db.Index('ix_exec_user_started', 'user_id', 'started_at', 'id'),
+        db.Index('ix_exec_script_status', 'script_id', 'status', 'exit_code'),
+        db.Index('ix_exec_user_status_started', 'user_id', 'status', 'started_at'),
+        db.Index('ix_exec_schedule_started', 'schedule_id', 'started_at'),
+        db.Index('ix_exec_script_started', 'script_id', 'started_at'),
+        db.Index('ix_exec_script_started_dur', 'script_id', 'started_at', 'duration_seconds',
+                 postgresql_where=duration_seconds.isnot(None),
+                 sqlite_where=duration_seconds.isnot(None)),
+    )
+    
     def __init__(self, script_id, user_id, trigger_type=ExecutionTrigger.MANUAL, schedule_id=None):
         self.script_id = script_id
         self.user_id = user_id
         self.trigger_type = trigger_type
         self.schedule_id = schedule_id
     
+    @classmethod
+    def create_indexes(cls):
+        """Create the composite indexes on databases whose executions table predates them"""
+        for index in cls.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    
+    @classmethod
+    def create_search_indexes(cls):
+        """Create the stdout/stderr search indexes for the current database"""
+        global _search_index_available
+        
+        dialect = db.engine.dialect.name
+        if dialect == 'postgresql':
+            statements = POSTGRES_SEARCH_DDL
+        elif dialect == 'sqlite':
+            statements = SQLITE_SEARCH_DDL
+        else:
+            return False
+        
+        with db.engine.begin() as connection:
+            for statement in statements:
+                connection.execute(text(statement))
+        
+        _search_index_available = None
+        return True
+    
+    @classmethod
+    def search_indexes_exist(cls):
+        """Whether create_search_indexes has run on this database (checked once per process)"""
+        global _search_index_available
+        
+        dialect = db.engine.dialect.name
+        if dialect not in SEARCH_INDEX_PROBES:
+            return False
+        
+        if _search_index_available is None:
+            _search_index_available = db.session.execute(
+                text(SEARCH_INDEX_PROBES[dialect])
+            ).first() is not None
+        return _search_index_available
+    
+    @classmethod
+    def output_search_filter(cls, search):
+        """Build the stdout/stderr search clause
+        
+        Uses the full-text index when create_search_indexes has run: a tsvector
+        match on PostgreSQL, the FTS5 trigram mirror on SQLite (which needs at
+        least three characters). Otherwise falls back to LIKE on both columns.
+        """
+        if cls.search_indexes_exist():
+            if db.engine.dialect.name == 'postgresql':
+                return literal_column('executions.search_vector').op('@@')(
+                    func.plainto_tsquery('pg_catalog.simple', search)
+                )
+            
+            if len(search) >= 3:
+                phrase = '"' + search.replace('"', '""') + '"'
+                return cls.id.in_(
+                    text("SELECT rowid FROM executions_fts WHERE executions_fts MATCH :phrase")
+                    .bindparams(phrase=phrase)
+                )
+        
+        return or_(cls.stdout.contains(search), cls.stderr.contains(search))
+    
     @property
     def is_running(self):
         """Check if execution is currently running"""
@@ -59,12 +210,7 @@ class Execution(db.Model):
     @property
     def is_finished(self):
         """Check if execution is finished (success or failure)"""
-        return self.status in [
-            ExecutionStatus.COMPLETED, 
-            ExecutionStatus.FAILED, 
-            ExecutionStatus.TIMEOUT,
-            ExecutionStatus.CANCELLED
-        ]
+        return self.status is not None and self.status.is_finished
     
     @property
     def is_successful(self):
@@ -74,19 +220,7 @@ class Execution(db.Model):
     @property
     def formatted_duration(self):
         """Get human-readable duration"""
-        if not self.duration_seconds:
-            return "N/A"
-        
-        if self.duration_seconds < 60:
-            return f"{self.duration_seconds:.1f}s"
-        elif self.duration_seconds < 3600:
-            minutes = int(self.duration_seconds // 60)
-            seconds = int(self.duration_seconds % 60)
-            return f"{minutes}m {seconds}s"
-        else:
-            hours = int(self.duration_seconds // 3600)
-            minutes = int((self.duration_seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        return format_duration(self.duration_seconds)
     
     @property
     def status_icon(self):
@@ -121,38 +255,35 @@ class Execution(db.Model):
         self.pid = pid
         db.session.commit()
     
+    def record_completion(self):
+        """Stamp completed_at and persist duration_seconds so stats can aggregate the column"""
+        self.completed_at = datetime.utcnow()
+        if self.started_at:
+            self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+    
     def complete_execution(self, exit_code, stdout='', stderr=''):
         """Mark execution as completed"""
-        self.completed_at = datetime.utcnow()
         self.exit_code = exit_code
         self.stdout = stdout
         self.stderr = stderr
         self.status = ExecutionStatus.COMPLETED if exit_code == 0 else ExecutionStatus.FAILED
-        
-        if self.started_at:
-            self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+        self.record_completion()
         
         db.session.commit()
     
     def timeout_execution(self):
         """Mark execution as timed out"""
-        self.completed_at = datetime.utcnow()
         self.status = ExecutionStatus.TIMEOUT
         self.exit_code = -1
-        
-        if self.started_at:
-            self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+        self.record_completion()
         
         db.session.commit()
     
     def cancel_execution(self):
         """Mark execution as cancelled"""
-        self.completed_at = datetime.utcnow()
         self.status = ExecutionStatus.CANCELLED
         self.exit_code = -2
-        
-        if self.started_at:
-            self.duration_seconds = (self.completed_at - self.started_at).total_seconds()
+        self.record_completion()
         
         db.session.commit()
     
@@ -170,4 +301,51 @@ class Execution(db.Model):
         return '\n'.join(preview_lines)
     
     def __repr__(self):
-        return f'<Execution {self.id} - {self.status.value}>'
\ No newline at end of file
+        return f'<Execution {self.id} - {self.status.value}>'
+
+
+# === SCRIPT EXECUTION COUNTERS ===
+# scripts.executions_total / executions_successful back Script.execution_count
+# and Script.success_rate; these mapper events keep them current in the same flush.
+
+def _is_successful(status, exit_code):
+    return status == ExecutionStatus.COMPLETED and exit_code == 0
+
+def _adjust_script_counters(connection, script_id, total_delta, successful_delta):
+    """Apply counter deltas to a script row"""
+    from app.models.script import Script
+    
+    scripts = Script.__table__
+    connection.execute(
+        scripts.update()
+        .where(scripts.c.id == script_id)
+        .values(
+            executions_total=scripts.c.executions_total + total_delta,
+            executions_successful=scripts.c.executions_successful + successful_delta
+        )
+    )
+
+@event.listens_for(Execution, 'after_insert')
+def _count_inserted_execution(mapper, connection, target):
+    successful = 1 if _is_successful(target.status, target.exit_code) else 0
+    _adjust_script_counters(connection, target.script_id, 1, successful)
+
+@event.listens_for(Execution, 'after_delete')
+def _count_deleted_execution(mapper, connection, target):
+    successful = 1 if _is_successful(target.status, target.exit_code) else 0
+    _adjust_script_counters(connection, target.script_id, -1, -successful)
+
+@event.listens_for(Execution, 'after_update')
+def _count_updated_execution(mapper, connection, target):
+    attrs = inspect(target).attrs
+    status_history = attrs.status.history
+    exit_code_history = attrs.exit_code.history
+    if not status_history.has_changes() and not exit_code_history.has_changes():
+        return
+    
+    old_status = status_history.deleted[0] if status_history.deleted else target.status
+    old_exit_code = exit_code_history.deleted[0] if exit_code_history.deleted else target.exit_code
+    
+    delta = int(_is_successful(target.status, target.exit_code)) - int(_is_successful(old_status, old_exit_code))
+    if delta:
+        _adjust_script_counters(connection, target.script_id, 0, delta)
@@ -0,0 +1,71 @@
+"""
+Schema upgrades - bring databases created by older versions up to the current models
+"""
+
+import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DatabaseError
+from sqlalchemy.schema import CreateColumn
+
+# Import db from models package
+from app.models import db
+
+logger = logging.getLogger(__name__)
+
+def add_missing_columns(model):
+    """
+    Add the columns a model maps but its existing table lacks
+    
+    Returns:
+        set: Names of the columns added
+    """
+    table = model.__table__
+    existing = {column['name'] for column in inspect(db.engine).get_columns(table.name)}
+    
+    added = set()
+    with db.engine.begin() as connection:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            
+            column_ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+            added.add(column.name)
+    return added
+
+def upgrade_database():
+    """
+    Create missing tables and columns, then backfill the columns just added
+    
+    Safe to run on every startup: each step checks the database first.
+    """
+    from app.models.execution import Execution
+    from app.models.schedule import Schedule
+    from app.models.script import Script
+    from app.models.user import User
+    
+    db.create_all()
+    
+    if 'target_hour' in add_missing_columns(Schedule):
+        Schedule.sync_config_columns()
+    
+    added = add_missing_columns(Script)
+    if 'executions_total' in added:
+        Script.sync_execution_counters()
+    if 'content_sha256' in added:
+        Script.sync_content_hashes()
+    
+    if 'active_schedule_count' in add_missing_columns(User):
+        User.sync_active_schedule_counts()
+    
+    # create_all only indexes the tables it creates
+    for model in (Execution, Schedule, Script):
+        try:
+            model.create_indexes()
+        except DatabaseError as e:
+            # e.g. existing rows violating the one-active-schedule-per-script index
+            logger.warning(f"Could not create indexes for {model.__tablename__}: {e}")
+    
+    # The full-text mirror is built once; rebuilding it reindexes every output
+    if not Execution.search_indexes_exist():
+        Execution.create_search_indexes()
@@ -3,8 +3,9 @@ Schedule Model - Script scheduling and automation
 """
 
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
+from sqlalchemy import case, event, func, inspect, select
 import json
 
 # Import db from models package
@@ -18,6 +19,84 @@ class ScheduleFrequency(Enum):
     HOURLY = 'hourly'
     INTERVAL = 'interval'
 
+# Map day names to weekday numbers (Monday=0, Sunday=6)
+WEEKDAY_NUMBERS = {
+    'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+    'Friday': 4, 'Saturday': 5, 'Sunday': 6
+}
+
+def parse_time_config(time_str):
+    """Parse an 'HH:MM' string into [hour, minute]"""
+    hour, minute = map(int, time_str.split(':'))
+    return [hour, minute]
+
+EPOCH = datetime(1970, 1, 1)
+
+def next_interval_runs(now, first_runs, intervals):
+    """Get the next run of each interval schedule, all values in epoch seconds
+    
+    Args:
+        now: Current time
+        first_runs: First run time of each schedule
+        intervals: Interval of each schedule
+    """
+    next_runs = []
+    for first_run, interval in zip(first_runs, intervals):
+        if first_run > now:
+            next_runs.append(first_run)
+        else:
+            next_runs.append(first_run + ((now - first_run) // interval + 1) * interval)
+    return next_runs
+
+def schedule_fields_from_config(config):
+    """Extract the scalar fields used by calculate_next_execution from a config dict
+    
+    Missing or invalid values are returned as None so callers apply their defaults.
+    """
+    fields = {
+        'target_hour': None,
+        'target_minute': None,
+        'weekday_mask': None,
+        'month_day': None,
+        'interval_minutes': None,
+        'start_date': None
+    }
+    
+    if 'time' in config:
+        try:
+            fields['target_hour'], fields['target_minute'] = parse_time_config(config['time'])
+        except (ValueError, AttributeError):
+            pass
+    
+    if 'days' in config:
+        mask = 0
+        for day in config['days']:
+            if day in WEEKDAY_NUMBERS:
+                mask |= 1 << WEEKDAY_NUMBERS[day]
+        fields['weekday_mask'] = mask
+    
+    if 'day' in config:
+        try:
+            fields['month_day'] = int(config['day'])
+        except (ValueError, TypeError):
+            pass
+    
+    if 'interval_minutes' in config:
+        try:
+            interval_minutes = int(config['interval_minutes'])
+            if interval_minutes > 0:
+                fields['interval_minutes'] = interval_minutes
+        except (ValueError, TypeError):
+            pass
+    
+    if config.get('start_date'):
+        try:
+            fields['start_date'] = date.fromisoformat(config['start_date'])
+        except (ValueError, TypeError):
+            pass
+    
+    return fields
+
 class Schedule(db.Model):
     """Schedule model for managing automated script execution"""
     
@@ -26,11 +105,23 @@ class Schedule(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
-    frequency = db.Column(db.Enum(ScheduleFrequency), nullable=False)
+    frequency = db.Column(db.Enum(ScheduleFrequency, native_enum=False), nullable=False)  # Stored as VARCHAR on every backend
     schedule_config = db.Column(db.Text)  # JSON config for complex schedules
+    
+    # Scalar copies of schedule_config fields, kept in sync by the config_dict setter
+    # so calculate_next_execution doesn't need to parse the JSON
+    target_hour = db.Column(db.SmallInteger)
+    target_minute = db.Column(db.SmallInteger)
+    weekday_mask = db.Column(db.SmallInteger)  # Bit N set = weekday N (Monday=0)
+    month_day = db.Column(db.SmallInteger)
+    interval_minutes = db.Column(db.Integer)  # Any positive number of minutes
+    start_date = db.Column(db.Date)
+    
     next_execution = db.Column(db.DateTime)
     last_execution = db.Column(db.DateTime)
-    is_active = db.Column(db.Boolean, default=True)
+    # active_history loads the committed value before an expired instance is
+    # changed, so the counter events below always see the old state
+    is_active = db.column_property(db.Column(db.Boolean, default=True), active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -40,17 +131,30 @@ class Schedule(db.Model):
     notification_emails = db.Column(db.Text)  # JSON array of email addresses
     
     # Foreign keys (EXTENDED for Integration feature - NON-BREAKING)
-    script_id = db.Column(db.Integer, db.ForeignKey('scripts.id'), nullable=True)  # Made nullable for Integration jobs
+    script_id = db.column_property(  # Made nullable for Integration jobs
+        db.Column(db.Integer, db.ForeignKey('scripts.id'), nullable=True),
+        active_history=True
+    )
     integration_id = db.Column(db.Integer, db.ForeignKey('integrations.id'), nullable=True)  # NEW: Integration support
     
     # Relationships
     executions = db.relationship('Execution', backref='schedule', lazy=True)
     
+    # Partial unique index: at most one active schedule per script, enforced by
+    # the database; also serves the active-schedule lookups by script
+    __table_args__ = (
+        db.Index('ix_schedules_active_script', 'script_id', unique=True,
+                 postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active')),
+    )
+    
     def __init__(self, name, frequency, schedule_config=None, description='', script_id=None, integration_id=None):
         """EXTENDED constructor for Integration support (BACKWARD COMPATIBLE)"""
         self.name = name
         self.frequency = frequency
-        self.schedule_config = schedule_config
+        if isinstance(schedule_config, dict):
+            self.config_dict = schedule_config
+        else:
+            self.schedule_config = schedule_config
         self.description = description
         
         # Support both script and integration scheduling (NEW)
@@ -65,18 +169,60 @@ class Schedule(db.Model):
     
     @property
     def config_dict(self):
-        """Get schedule configuration as dictionary"""
-        if not self.schedule_config:
-            return {}
-        try:
-            return json.loads(self.schedule_config)
-        except json.JSONDecodeError:
+        """Get schedule configuration as dictionary (parsed once per stored JSON string)"""
+        raw = self.schedule_config
+        if not raw:
             return {}
+        
+        cached = self.__dict__.get('_parsed_config')
+        if cached is None or cached[0] is not raw:
+            try:
+                parsed = json.loads(raw)
+            except json.JSONDecodeError:
+                parsed = {}
+            cached = self._parsed_config = (raw, parsed)
+        return dict(cached[1])
     
     @config_dict.setter
     def config_dict(self, value):
-        """Set schedule configuration from dictionary"""
+        """Set schedule configuration from dictionary and sync the scalar columns"""
         self.schedule_config = json.dumps(value) if value else None
+        self._parsed_config = (self.schedule_config, dict(value)) if value else None
+        
+        for column, field_value in schedule_fields_from_config(value or {}).items():
+            setattr(self, column, field_value)
+    
+    @classmethod
+    def create_indexes(cls):
+        """Create the partial index on databases whose schedules table predates it"""
+        for index in cls.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+    
+    @classmethod
+    def deactivate_for_script(cls, script_id):
+        """
+        Deactivate every active schedule of a script with a single UPDATE
+        
+        Bulk updates bypass the mapper events, so the owner's active schedule
+        counter is adjusted here in the same transaction.
+        
+        Returns:
+            int: Number of schedules deactivated
+        """
+        deactivated = cls.query.filter(cls.script_id == script_id, cls.is_active == True)\
+            .update({cls.is_active: False})
+        if deactivated:
+            _adjust_active_schedule_count(db.session.connection(), script_id, -deactivated)
+        return deactivated
+    
+    @classmethod
+    def sync_config_columns(cls):
+        """Populate the scalar config columns for schedules saved before they existed"""
+        schedules = cls.query.filter(cls.schedule_config.isnot(None), cls.target_hour.is_(None)).all()
+        for schedule in schedules:
+            schedule.config_dict = schedule.config_dict
+        db.session.commit()
+        return len(schedules)
     
     @property
     def notification_email_list(self):
@@ -96,11 +242,15 @@ class Schedule(db.Model):
     @property
     def recent_executions_count(self):
         """Get count of executions in last 30 days"""
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        return Execution.query.filter(
+        return self.count_executions_since(datetime.utcnow() - timedelta(days=30))
+    
+    def count_executions_since(self, cutoff):
+        """Get count of executions started at or after cutoff"""
+        from app.models.execution import Execution
+        return db.session.query(func.count(Execution.id)).filter(
             Execution.schedule_id == self.id,
-            Execution.started_at >= thirty_days_ago
-        ).count()
+            Execution.started_at >= cutoff
+        ).scalar()
     
     @property
     def success_rate(self):
@@ -109,11 +259,12 @@ class Schedule(db.Model):
         if total == 0:
             return 100  # No executions yet, assume will be successful
         
-        successful = Execution.query.filter(
+        from app.models.execution import Execution
+        successful = db.session.query(func.count(Execution.id)).filter(
             Execution.schedule_id == self.id,
             Execution.status == 'completed',
             Execution.exit_code == 0
-        ).count()
+        ).scalar()
         
         return round((successful / total) * 100, 1)
     
@@ -123,9 +274,10 @@ class Schedule(db.Model):
         if not self.is_active:
             return '⏸️'
         
-        if self.success_rate >= 90:
+        success_rate = self.success_rate
+        if success_rate >= 90:
             return '✅'
-        elif self.success_rate >= 70:
+        elif success_rate >= 70:
             return '⚠️'
         else:
             return '❌'
@@ -158,40 +310,50 @@ class Schedule(db.Model):
         
         return self.frequency.value.title()
     
-    def calculate_next_execution(self):
-        """Calculate next execution time based on frequency and config"""
+    def calculate_next_execution(self, now=None):
+        """Calculate next execution time based on frequency and config
+        
+        Args:
+            now: Reference time (defaults to utcnow); sweeps pass one value for all schedules
+        """
         if not self.is_active:
             return None
         
-        now = datetime.utcnow()
-        config = self.config_dict
+        now = now or datetime.utcnow()
         
         if self.frequency == ScheduleFrequency.HOURLY:
             # Next hour
             return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         
-        elif self.frequency == ScheduleFrequency.INTERVAL:
+        if self.target_hour is not None:
+            fields = {
+                'target_hour': self.target_hour,
+                'target_minute': self.target_minute,
+                'weekday_mask': self.weekday_mask,
+                'month_day': self.month_day,
+                'interval_minutes': self.interval_minutes,
+                'start_date': self.start_date
+            }
+        else:
+            # Schedules saved before the scalar columns existed
+            fields = schedule_fields_from_config(self.config_dict)
+        
+        start_date = fields['start_date']
+        
+        if self.frequency == ScheduleFrequency.INTERVAL:
             # Next execution based on interval minutes and start time
-            interval_minutes = config.get('interval_minutes', 15)
-            start_time = config.get('time', '09:00')
-            start_date = config.get('start_date')
-            
-            try:
-                interval_minutes = int(interval_minutes)
-                if interval_minutes <= 0:
-                    interval_minutes = 15
-            except (ValueError, TypeError):
-                interval_minutes = 15
+            interval_minutes = fields['interval_minutes'] or 15
             
             try:
-                # Parse start time
-                hour, minute = map(int, start_time.split(':'))
+                # Start time defaults to 09:00
+                if fields['target_hour'] is None:
+                    hour, minute = 9, 0
+                else:
+                    hour, minute = fields['target_hour'], fields['target_minute']
                 
                 # Determine the start datetime
                 if start_date:
-                    # Parse start date (format: YYYY-MM-DD)
-                    start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-                    first_run = start_date_obj.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                    first_run = datetime(start_date.year, start_date.month, start_date.day, hour, minute)
                 else:
                     # Use today with specified time
                     first_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
@@ -207,23 +369,19 @@ class Schedule(db.Model):
                     # First run is in the future, use it
                     return first_run
                     
-            except (ValueError, AttributeError):
-                # Fallback to current time + interval if parsing fails
+            except ValueError:
+                # Fallback to current time + interval if the time is out of range
                 return now + timedelta(minutes=interval_minutes)
         
-        elif self.frequency == ScheduleFrequency.DAILY:
-            # Parse time and start_date from config (format: "HH:MM")
-            time_str = config.get('time', '00:00')
-            start_date = config.get('start_date')
-            
+        # Remaining frequencies default to midnight
+        hour = fields['target_hour'] or 0
+        minute = fields['target_minute'] or 0
+        
+        if self.frequency == ScheduleFrequency.DAILY:
             try:
-                hour, minute = map(int, time_str.split(':'))
-                
                 # Determine the start datetime
                 if start_date:
-                    # Parse start date (format: YYYY-MM-DD)
-                    start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-                    next_run = start_date_obj.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                    next_run = datetime(start_date.year, start_date.month, start_date.day, hour, minute)
                 else:
                     # Use today with specified time
                     next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
@@ -233,45 +391,30 @@ class Schedule(db.Model):
                     next_run += timedelta(days=1)
                 
                 return next_run
-            except (ValueError, AttributeError):
+            except ValueError:
                 # Default to midnight if config is invalid
                 return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
         
         elif self.frequency == ScheduleFrequency.WEEKLY:
-            # Parse time and days from config
-            time_str = config.get('time', '00:00')
-            days = config.get('days', ['Monday'])
-            
-            # Map day names to weekday numbers (Monday=0, Sunday=6)
-            day_map = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-                'Friday': 4, 'Saturday': 5, 'Sunday': 6
-            }
+            # Default to Monday when no valid days are configured
+            mask = fields['weekday_mask'] or 1
             
             try:
-                hour, minute = map(int, time_str.split(':'))
-                target_weekdays = [day_map[day] for day in days if day in day_map]
+                # Find next occurrence: rotate the weekday mask so bit 0 is today;
+                # the lowest set bit is the number of days ahead
+                current_weekday = now.weekday()
+                candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
                 
-                if not target_weekdays:
-                    target_weekdays = [0]  # Default to Monday
+                rotated = ((mask >> current_weekday) | (mask << (7 - current_weekday))) & 0x7F
                 
-                # Find next occurrence
-                current_weekday = now.weekday()
-                days_ahead = None
+                if candidate <= now:
+                    rotated &= ~1  # Today's run time has passed
                 
-                for target_day in sorted(target_weekdays):
-                    days_until = (target_day - current_weekday) % 7
-                    candidate = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    
-                    if days_until == 0 and candidate <= now:
-                        days_until = 7  # Next week
-                    
-                    if days_ahead is None or days_until < days_ahead:
-                        days_ahead = days_until
+                days_ahead = (rotated & -rotated).bit_length() - 1 if rotated else 7  # Next week
                 
-                return now.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=days_ahead)
+                return candidate + timedelta(days=days_ahead)
             
-            except (ValueError, AttributeError):
+            except ValueError:
                 # Default to next Monday at midnight
                 days_ahead = (0 - now.weekday()) % 7
                 if days_ahead == 0:
@@ -279,13 +422,9 @@ class Schedule(db.Model):
                 return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=days_ahead)
         
         elif self.frequency == ScheduleFrequency.MONTHLY:
-            # Parse time and day from config
-            time_str = config.get('time', '00:00')
-            target_day = config.get('day', 1)
+            target_day = fields['month_day'] or 1
             
             try:
-                hour, minute = map(int, time_str.split(':'))
-                
                 # Start with current month
                 next_run = now.replace(day=target_day, hour=hour, minute=minute, second=0, microsecond=0)
                 
@@ -298,7 +437,7 @@ class Schedule(db.Model):
                 
                 return next_run
             
-            except (ValueError, AttributeError):
+            except ValueError:
                 # Default to 1st of next month at midnight
                 if now.month == 12:
                     return now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -307,21 +446,68 @@ class Schedule(db.Model):
         
         return None
     
-    def update_next_execution(self):
-        """Update next execution time and save to database"""
-        self.next_execution = self.calculate_next_execution()
+    def update_next_execution(self, now=None, commit=True):
+        """Update next execution time and save to database
+        
+        Args:
+            now: Reference time passed to calculate_next_execution
+            commit: Commit immediately; batch sweeps pass False and commit once at the end
+        """
+        self.next_execution = self.calculate_next_execution(now)
+        if commit:
+            db.session.commit()
+    
+    @classmethod
+    def recompute_all_next_executions(cls):
+        """Recalculate next execution for all active schedules in a single UPDATE batch"""
+        now = datetime.utcnow()
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        
+        now_epoch = int((now - EPOCH).total_seconds())
+        
+        mappings = []
+        interval_ids, first_runs, intervals = [], [], []
+        for schedule in cls.query.filter_by(is_active=True).all():
+            # Every hourly schedule shares the same next run, compute it once
+            if schedule.frequency == ScheduleFrequency.HOURLY:
+                mappings.append({'id': schedule.id, 'next_execution': next_hour})
+                continue
+            
+            # Interval schedules are batched into integer arithmetic below
+            if schedule.frequency == ScheduleFrequency.INTERVAL and schedule.target_hour is not None:
+                start_date = schedule.start_date or now.date()
+                try:
+                    first_run = datetime(start_date.year, start_date.month, start_date.day,
+                                         schedule.target_hour, schedule.target_minute)
+                except ValueError:
+                    pass
+                else:
+                    interval_ids.append(schedule.id)
+                    first_runs.append(int((first_run - EPOCH).total_seconds()))
+                    intervals.append((schedule.interval_minutes or 15) * 60)
+                    continue
+            
+            mappings.append({'id': schedule.id, 'next_execution': schedule.calculate_next_execution(now)})
+        
+        for schedule_id, next_epoch in zip(interval_ids, next_interval_runs(now_epoch, first_runs, intervals)):
+            mappings.append({'id': schedule_id, 'next_execution': EPOCH + timedelta(seconds=next_epoch)})
+        
+        if mappings:
+            db.session.bulk_update_mappings(cls, mappings)
         db.session.commit()
+        return len(mappings)
     
     def mark_executed(self):
         """Mark schedule as executed and calculate next run"""
-        self.last_execution = datetime.utcnow()
-        self.update_next_execution()
+        now = datetime.utcnow()
+        self.last_execution = now
+        self.update_next_execution(now)
     
     def toggle_active(self):
         """Toggle schedule active status"""
         self.is_active = not self.is_active
         if self.is_active:
-            self.update_next_execution()
+            self.update_next_execution(commit=False)
         else:
             self.next_execution = None
         db.session.commit()
@@ -410,48 +596,60 @@ class Schedule(db.Model):
     
     @property
     def execution_statistics(self):
-        """Get execution statistics (NEW - supports both types)"""
-        history = self.get_execution_history(limit=50)  # Last 50 executions
+        """Get execution statistics over the last 50 executions (NEW - supports both types)
         
-        if not history:
-            return {
-                'total': 0,
-                'successful': 0,
-                'failed': 0,
-                'success_rate': 0,
-                'avg_duration': 0
-            }
+        Counts and durations are aggregated in SQL so no execution rows are loaded.
+        """
+        empty_stats = {
+            'total': 0,
+            'successful': 0,
+            'failed': 0,
+            'success_rate': 0,
+            'avg_duration': 0
+        }
         
-        total = len(history)
-        successful = 0
-        failed = 0
-        total_duration = 0
-        
-        for exec_item in history:
-            if hasattr(exec_item, 'is_completed'):
-                if exec_item.is_completed:
-                    successful += 1
-                elif exec_item.is_failed:
-                    failed += 1
-            else:
-                # Fallback for script executions
-                if exec_item.status == 'completed':
-                    successful += 1
-                else:
-                    failed += 1
-            
-            if exec_item.duration_seconds:
-                total_duration += exec_item.duration_seconds
+        if self.is_script_schedule:
+            from app.models.execution import Execution as execution_model, ExecutionStatus
+            # Script executions count every non-completed status as failed
+            completed_statuses = [ExecutionStatus.COMPLETED]
+            failed_statuses = [status for status in ExecutionStatus if status != ExecutionStatus.COMPLETED]
+        elif self.is_integration_schedule:
+            from app.models.integration_execution import IntegrationExecution as execution_model, IntegrationExecutionStatus
+            completed_statuses = [IntegrationExecutionStatus.COMPLETED]
+            failed_statuses = [
+                IntegrationExecutionStatus.FAILED,
+                IntegrationExecutionStatus.TIMEOUT,
+                IntegrationExecutionStatus.CANCELLED
+            ]
+        else:
+            return empty_stats
+        
+        recent = db.session.query(
+            execution_model.status.label('status'),
+            execution_model.duration_seconds.label('duration_seconds')
+        ).filter(execution_model.schedule_id == self.id)\
+         .order_by(execution_model.started_at.desc())\
+         .limit(50).subquery()
         
-        success_rate = round((successful / total) * 100, 1) if total > 0 else 0
-        avg_duration = round(total_duration / total, 2) if total > 0 else 0
+        total, successful, failed, total_duration = db.session.query(
+            func.count(),
+            func.sum(case((recent.c.status.in_(completed_statuses), 1), else_=0)),
+            func.sum(case((recent.c.status.in_(failed_statuses), 1), else_=0)),
+            func.sum(recent.c.duration_seconds)
+        ).one()
+        
+        if not total:
+            return empty_stats
+        
+        successful = successful or 0
+        total_duration = total_duration or 0
         
         return {
             'total': total,
             'successful': successful,
-            'failed': failed,
-            'success_rate': success_rate,
-            'avg_duration': avg_duration
+            'failed': failed or 0,
+            'success_rate': round((successful / total) * 100, 1),
+            'avg_duration': round(total_duration / total, 2)
         }
     
     def validate_for_integration(self):
@@ -482,4 +680,48 @@ class Schedule(db.Model):
     # === END NEW INTEGRATION METHODS ===
     
     def __repr__(self):
-        return f'<Schedule {self.name} - {self.frequency.value} ({self.schedule_type})>'
\ No newline at end of file
+        return f'<Schedule {self.name} - {self.frequency.value} ({self.schedule_type})>'
+
+
+# === ACTIVE SCHEDULE COUNTER ===
+# users.active_schedule_count mirrors the number of active script schedules a
+# user owns; these mapper events keep it current within the same flush.
+
+def _adjust_active_schedule_count(connection, script_id, delta):
+    """Add delta to the counter of the user owning script_id"""
+    from app.models.script import Script
+    from app.models.user import User
+    
+    users = User.__table__
+    owner_id = select(Script.user_id).where(Script.id == script_id).scalar_subquery()
+    connection.execute(
+        users.update()
+        .where(users.c.id == owner_id)
+        .values(active_schedule_count=users.c.active_schedule_count + delta)
+    )
+
+@event.listens_for(Schedule, 'after_insert')
+def _count_inserted_schedule(mapper, connection, target):
+    if target.script_id and target.is_active is not False:
+        _adjust_active_schedule_count(connection, target.script_id, 1)
+
+@event.listens_for(Schedule, 'after_delete')
+def _count_deleted_schedule(mapper, connection, target):
+    if target.script_id and target.is_active is not False:
+        _adjust_active_schedule_count(connection, target.script_id, -1)
+
+@event.listens_for(Schedule, 'after_update')
+def _count_updated_schedule(mapper, connection, target):
+    attrs = inspect(target).attrs
+    active_history = attrs.is_active.history
+    script_history = attrs.script_id.history
+    if not active_history.has_changes() and not script_history.has_changes():
+        return
+    
+    was_active = active_history.deleted[0] if active_history.deleted else target.is_active
+    old_script_id = script_history.deleted[0] if script_history.deleted else target.script_id
+    
+    if old_script_id and was_active is not False:
+        _adjust_active_schedule_count(connection, old_script_id, -1)
+    if target.script_id and target.is_active is not False:
+        _adjust_active_schedule_count(connection, target.script_id, 1)
@@ -3,12 +3,55 @@ Script Model - Uploaded script management
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, func, text
+from collections import namedtuple
 from datetime import datetime
+from functools import cached_property
+import hashlib
 import os
+import re
+import time
 
 # Import db from models package
 from app.models import db
 
+# Keywords inspected by validate_sql_content, matched as whole words in one pass
+SQL_DANGEROUS_OPERATIONS = ('DROP', 'DELETE', 'TRUNCATE', 'CREATE', 'ALTER')
+SQL_KEYWORD_RE = re.compile(
+    r'\b(' + '|'.join(SQL_DANGEROUS_OPERATIONS + ('SELECT',)) + r')\b',
+    re.IGNORECASE
+)
+
+# Trigram index serving the scripts list name search on PostgreSQL (ILIKE '%term%');
+# not mapped on the model so create_all stays portable
+POSTGRES_NAME_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_scripts_name_trgm ON scripts USING gin (name gin_trgm_ops)",
+]
+
+# Read size for streaming script files through sha256
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Lightweight, detached view of a script for dropdowns and listings
+ScriptOption = namedtuple('ScriptOption', ['id', 'name', 'script_type'])
+
+class ScriptListItem(namedtuple('ScriptListItem', [
+    'id', 'name', 'description', 'script_type', 'file_size', 'updated_at',
+    'executions_total', 'executions_successful'
+])):
+    """Detached row of the scripts list, safe to cache across requests"""
+    __slots__ = ()
+    
+    @classmethod
+    def columns(cls):
+        """The Script columns to select, in field order"""
+        return [getattr(Script, field) for field in cls._fields]
+
+# Per-user cache of active script options: user_id -> (expires_at, [ScriptOption]);
+# script writes drop the owner's entry
+ACTIVE_SCRIPTS_CACHE_TTL = 600  # seconds
+_active_scripts_cache = {}
+
 class Script(db.Model):
     """Script model for managing uploaded automation scripts"""
     
@@ -21,10 +64,15 @@ class Script(db.Model):
     file_path = db.Column(db.String(500), nullable=False)
     script_type = db.Column(db.String(10), nullable=False)  # 'py', 'bat', or 'sql'
     file_size = db.Column(db.Integer)  # in bytes
+    content_sha256 = db.Column(db.String(64))  # hex digest of the uploaded file
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    # Execution counters, maintained by Execution events
+    executions_total = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    executions_successful = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Foreign key
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
@@ -32,7 +80,20 @@ class Script(db.Model):
     executions = db.relationship('Execution', backref='script', lazy=True, cascade='all, delete-orphan')
     schedules = db.relationship('Schedule', backref='script', lazy=True, cascade='all, delete-orphan')
     
-    def __init__(self, name, description, filename, file_path, script_type, user_id, file_size=None):
+    # Partial indexes: listings only ever read a user's active scripts, by default
+    # newest first (optionally narrowed by type) or by size, so each list variant
+    # is an ordered index scan instead of a filter plus sort
+    __table_args__ = (
+        db.Index('ix_scripts_active_user_updated', 'user_id', 'updated_at',
+                 postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active')),
+        db.Index('ix_scripts_active_user_type_updated', 'user_id', 'script_type', 'updated_at',
+                 postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active')),
+        db.Index('ix_scripts_active_user_size', 'user_id', 'file_size',
+                 postgresql_where=db.text('is_active'), sqlite_where=db.text('is_active')),
+    )
+    
+    def __init__(self, name, description, filename, file_path, script_type, user_id, file_size=None,
+                 content_sha256=None):
         self.name = name
         self.description = description
         self.filename = filename
@@ -40,12 +101,48 @@ class Script(db.Model):
         self.script_type = script_type
         self.user_id = user_id
         self.file_size = file_size
+        self.content_sha256 = content_sha256
     
-    @property
+    @cached_property
     def file_exists(self):
-        """Check if the script file still exists on disk"""
+        """Check if the script file still exists on disk (cached per instance)"""
         return os.path.exists(self.file_path)
     
+    @classmethod
+    def active_options_for_user(cls, user_id):
+        """Get a user's active scripts as ScriptOption tuples ordered by name (cached)"""
+        now = time.monotonic()
+        cached = _active_scripts_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        options = [
+            ScriptOption(*row) for row in db.session.query(cls.id, cls.name, cls.script_type)
+            .filter(cls.user_id == user_id, cls.is_active == True)
+            .order_by(cls.name)
+        ]
+        _active_scripts_cache[user_id] = (now + ACTIVE_SCRIPTS_CACHE_TTL, options)
+        return options
+    
+    @classmethod
+    def create_indexes(cls):
+        """Create the listing and name search indexes on databases whose scripts table predates them"""
+        for index in cls.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        
+        with db.engine.begin() as connection:
+            # Superseded by ix_scripts_active_user_updated
+            connection.execute(text("DROP INDEX IF EXISTS ix_scripts_active_user"))
+            if db.engine.dialect.name == 'postgresql':
+                for statement in POSTGRES_NAME_SEARCH_DDL:
+                    connection.execute(text(statement))
+    
+    @classmethod
+    def name_search_filter(cls, search):
+        """Case-insensitive substring match on the name, written as ILIKE so the trigram index applies"""
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return cls.name.ilike(f'%{escaped}%', escape='\\')
+    
     @property
     def last_execution(self):
         """Get the most recent execution"""
@@ -59,7 +156,7 @@ class Script(db.Model):
     @property
     def execution_count(self):
         """Get total execution count"""
-        return Execution.query.filter_by(script_id=self.id).count()
+        return self.executions_total or 0
     
     @property
     def success_rate(self):
@@ -67,28 +164,60 @@ class Script(db.Model):
         total = self.execution_count
         if total == 0:
             return 0
-        successful = Execution.query.filter_by(
-            script_id=self.id, 
-            status='completed'
-        ).count()
-        return round((successful / total) * 100, 1)
+        return round(((self.executions_successful or 0) / total) * 100, 1)
+    
+    @classmethod
+    def sync_execution_counters(cls):
+        """Recompute the execution counters for every script from the executions table"""
+        from app.models.execution import Execution, ExecutionStatus
+        
+        total = db.session.query(func.count(Execution.id))\
+            .filter(Execution.script_id == cls.id).scalar_subquery()
+        successful = db.session.query(func.count(Execution.id)).filter(
+            Execution.script_id == cls.id,
+            Execution.status == ExecutionStatus.COMPLETED,
+            Execution.exit_code == 0
+        ).scalar_subquery()
+        cls.query.update({
+            cls.executions_total: total,
+            cls.executions_successful: successful
+        }, synchronize_session=False)
+        db.session.commit()
+    
+    @classmethod
+    def sync_content_hashes(cls):
+        """Fill content_sha256 for scripts uploaded before the column existed"""
+        scripts = cls.query.filter(cls.content_sha256.is_(None)).all()
+        for script in scripts:
+            try:
+                with open(script.file_path, 'rb') as f:
+                    digest = hashlib.sha256()
+                    while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                script.content_sha256 = digest.hexdigest()
+            except OSError:
+                continue  # File missing on disk; leave the hash empty
+        db.session.commit()
+        return len(scripts)
     
     def get_formatted_size(self):
         """Get human-readable file size"""
         if not self.file_size:
             return "Unknown"
         
+        size = self.file_size
         for unit in ['B', 'KB', 'MB']:
-            if self.file_size < 1024:
-                return f"{self.file_size:.1f} {unit}"
-            self.file_size /= 1024
-        return f"{self.file_size:.1f} GB"
+            if size < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
     
     def delete_file(self):
         """Delete the physical file from disk"""
         if self.file_exists:
             try:
                 os.remove(self.file_path)
+                self.__dict__.pop('file_exists', None)
                 return True
             except OSError:
                 return False
@@ -122,15 +251,16 @@ class Script(db.Model):
             return None
         
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except (IOError, UnicodeDecodeError):
-            try:
-                # Try with different encoding
-                with open(self.file_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except (IOError, UnicodeDecodeError):
-                return None
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+        except IOError:
+            return None
+        
+        # Decode the single read; latin-1 accepts any byte sequence
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return raw.decode('latin-1')
     
     def validate_sql_content(self):
         """Validate SQL script content for Integration use (NEW)"""
@@ -143,16 +273,17 @@ class Script(db.Model):
         
         errors = []
         warnings = []
-        content_upper = content.upper()
+        
+        # Single scan collecting every keyword present
+        found = {match.upper() for match in SQL_KEYWORD_RE.findall(content)}
         
         # Check for dangerous SQL operations
-        dangerous_ops = ['DROP', 'DELETE', 'TRUNCATE', 'CREATE', 'ALTER']
-        for op in dangerous_ops:
-            if op in content_upper:
+        for op in SQL_DANGEROUS_OPERATIONS:
+            if op in found:
                 errors.append(f"SQL script contains potentially dangerous operation: {op}")
         
         # Check for common SQL patterns
-        if 'SELECT' not in content_upper:
+        if 'SELECT' not in found:
             warnings.append("SQL script does not contain SELECT statement")
         
         if ';' not in content:
@@ -173,7 +304,15 @@ class Script(db.Model):
     @property
     def is_used_in_integrations(self):
         """Check if script is used in any integrations (NEW)"""
-        return self.integration_usage_count > 0
+        try:
+            # Import here to avoid circular imports
+            from app.models.integration import Integration
+            # EXISTS stops at the first match instead of counting every row
+            return db.session.query(
+                Integration.query.filter_by(python_script_id=self.id).exists()
+            ).scalar()
+        except ImportError:
+            return False
     
     def get_integration_usage(self):
         """Get list of integrations using this script (NEW)"""
@@ -187,4 +326,11 @@ class Script(db.Model):
     # === END NEW INTEGRATION METHODS ===
     
     def __repr__(self):
-        return f'<Script {self.name} ({self.script_type})>'
\ No newline at end of file
+        return f'<Script {self.name} ({self.script_type})>'
+
+@event.listens_for(Script, 'after_insert')
+@event.listens_for(Script, 'after_update')
+@event.listens_for(Script, 'after_delete')
+def _invalidate_active_scripts(mapper, connection, target):
+    """Drop the owner's cached script options when one of their scripts changes"""
+    _active_scripts_cache.pop(target.user_id, None)
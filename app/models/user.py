@@ -5,11 +5,16 @@ User Model - Authentication and user management
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import check_password_hash, generate_password_hash
+from sqlalchemy import func
 from datetime import datetime
 
 # Import db from models package
 from app.models import db
 
+# Hashing parameters are fixed here and only applied when a password is set;
+# check_password_hash reads them back from the stored hash
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:600000'
+
 class User(UserMixin, db.Model):
     """User model for authentication and user management"""
     
@@ -22,6 +27,7 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
+    active_schedule_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Maintained by Schedule events
     
     # Relationships
     scripts = db.relationship('Script', backref='owner', lazy=True)
@@ -34,27 +40,54 @@ class User(UserMixin, db.Model):
     
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, method=PASSWORD_HASH_METHOD)
     
     def check_password(self, password):
-        """Check if provided password is correct"""
-        return check_password_hash(self.password_hash, password)
+        """Check if provided password is correct
+        
+        Only called from the login form; authenticated requests are resolved
+        from the Flask-Login session and never re-hash the password.
+        """
+        if not check_password_hash(self.password_hash, password):
+            return False
+        
+        # Upgrade hashes created with older parameters while the plaintext is at hand
+        if not self.password_hash.startswith(PASSWORD_HASH_METHOD + '$'):
+            self.set_password(password)
+        return True
     
-    def update_last_login(self):
-        """Update last login timestamp"""
+    def update_last_login(self, commit=True):
+        """Update last login timestamp
+        
+        Args:
+            commit: Commit immediately; the login view passes False and commits once itself
+        """
         self.last_login = datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     def get_scripts_count(self):
         """Get count of user's scripts"""
-        return Script.query.filter_by(user_id=self.id).count()
+        from app.models.script import Script
+        return db.session.query(func.count(Script.id))\
+            .filter(Script.user_id == self.id).scalar()
     
     def get_active_schedules_count(self):
         """Get count of user's active schedules"""
-        return Schedule.query.join(Script).filter(
-            Script.user_id == self.id,
+        return self.active_schedule_count or 0
+    
+    @classmethod
+    def sync_active_schedule_counts(cls):
+        """Recompute active_schedule_count for every user from the schedules table"""
+        from app.models.script import Script
+        from app.models.schedule import Schedule
+        
+        active_count = db.session.query(func.count(Schedule.id)).join(Script).filter(
+            Script.user_id == cls.id,
             Schedule.is_active == True
-        ).count()
+        ).scalar_subquery()
+        cls.query.update({cls.active_schedule_count: active_count}, synchronize_session=False)
+        db.session.commit()
     
     def __repr__(self):
         return f'<User {self.username}>'
\ No newline at end of file
@@ -1 +1,15 @@
-# ScriptFlow Routes/Controllers
\ No newline at end of file
+# ScriptFlow Routes/Controllers
+
+from flask import current_app
+from sqlalchemy.orm import raiseload
+
+def strict_loading(query):
+    """
+    Make relationship loads a query did not declare raise instead of lazy-loading
+    
+    Enabled by the STRICT_LOADING config flag (defaults to TESTING) so debug and
+    test runs surface N+1 regressions while production keeps lazy loading.
+    """
+    if current_app.config.get('STRICT_LOADING', current_app.testing):
+        return query.options(raiseload('*'))
+    return query
@@ -6,6 +6,7 @@ from flask import Blueprint, render_template, request, flash, redirect, url_for
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash
 
+from app.models import db
 from app.models.user import User
 
 auth_bp = Blueprint('auth', __name__)
@@ -34,10 +35,14 @@ def login():
         if user and user.check_password(password):
             # Successful login
             login_user(user, remember=remember)
-            user.update_last_login()
+            user.update_last_login(commit=False)
             
             flash(f'Welcome back, {user.username}!', 'success')
             
+            # Single commit for last_login and any password rehash, issued after the
+            # user's attributes are read so expire-on-commit doesn't force a reload
+            db.session.commit()
+            
             # Redirect to next page or dashboard
             next_page = request.args.get('next')
             if next_page:
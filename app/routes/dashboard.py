@@ -4,13 +4,16 @@ Dashboard Routes - Main dashboard and overview
 
 from flask import Blueprint, render_template
 from flask_login import login_required, current_user
-from sqlalchemy import func
+from sqlalchemy import func, case, and_, event
+from sqlalchemy.orm import selectinload, load_only, defer
 from datetime import datetime, timedelta
+import time
 
+from app.models import db
 from app.models.script import Script
 from app.models.execution import Execution, ExecutionStatus
 from app.models.schedule import Schedule
-from app.services.script_executor import script_executor
+from app.services.script_executor import script_executor, running_execution_ids
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -20,40 +23,95 @@ dashboard_bp = Blueprint('dashboard', __name__)
 def index():
     """Main dashboard page"""
     
-    # Get user's scripts
-    user_scripts = Script.query.filter_by(user_id=current_user.id, is_active=True).all()
+    user_id = current_user.id
     
-    # Get recent executions (last 10)
-    recent_executions = Execution.query.filter_by(user_id=current_user.id)\
+    # Get user's scripts (only the columns the list shows)
+    user_scripts = Script.query.options(load_only(
+        Script.id, Script.name, Script.script_type, Script.file_size, Script.is_active
+    )).filter_by(user_id=user_id, is_active=True).all()
+    
+    # Get recent executions (last 10), leaving the stdout/stderr TEXT columns unloaded
+    recent_executions = Execution.query.options(
+        load_only(Execution.id, Execution.status, Execution.started_at,
+                  Execution.duration_seconds, Execution.exit_code, Execution.script_id),
+        selectinload(Execution.script)
+    ).filter_by(user_id=user_id)\
         .order_by(Execution.started_at.desc())\
         .limit(10).all()
     
     # Get active schedules
     active_schedules = Schedule.query.join(Script)\
-        .filter(Script.user_id == current_user.id, Schedule.is_active == True)\
+        .options(selectinload(Schedule.script))\
+        .filter(Script.user_id == user_id, Schedule.is_active == True)\
         .order_by(Schedule.next_execution).all()
     
+    # Per-script execution summaries (one grouped query instead of N property lookups)
+    script_summaries = get_script_summaries(user_id, active_schedules)
+    
     # Calculate statistics
-    stats = calculate_dashboard_stats(current_user.id)
+    stats = calculate_dashboard_stats(user_id)
     
     # Get currently running executions
-    running_executions = get_running_executions(current_user.id)
+    running_executions = get_running_executions(user_id)
     
     # Get system status
     system_status = {
-        'total_running': len(script_executor.get_running_executions()),
+        'total_running': len(running_execution_ids()),
         'max_concurrent': script_executor.max_concurrent,
         'next_scheduled': get_next_scheduled_execution()
     }
     
     return render_template('dashboard/index.html',
                          scripts=user_scripts,
+                         script_summaries=script_summaries,
                          recent_executions=recent_executions,
                          active_schedules=active_schedules,
                          stats=stats,
                          running_executions=running_executions,
                          system_status=system_status)
 
+def get_script_summaries(user_id, active_schedules):
+    """Aggregate execution totals, last execution and active schedule per script"""
+    
+    # Totals come from the counters on the script row; the latest execution of
+    # each script is one probe of ix_exec_script_started, so only a row per
+    # script is read and the stdout/stderr TEXT columns stay unloaded
+    latest_execution_id = db.session.query(Execution.id)\
+        .filter(Execution.script_id == Script.id)\
+        .order_by(Execution.started_at.desc(), Execution.id.desc())\
+        .limit(1).correlate(Script).scalar_subquery()
+    
+    rows = db.session.query(Script.id, Script.executions_total, Script.executions_successful, Execution)\
+        .join(Execution, Execution.id == latest_execution_id)\
+        .options(load_only(Execution.id, Execution.script_id, Execution.status,
+                           Execution.started_at, Execution.exit_code))\
+        .filter(Script.user_id == user_id).all()
+    
+    summaries = {}
+    for script_id, total, successful, execution in rows:
+        successful = successful or 0
+        summaries[script_id] = {
+            'total': total,
+            'successful': successful,
+            'success_rate': round(successful / total * 100, 1) if total else 0,
+            'last_execution': execution,
+            'active_schedule': None
+        }
+    
+    # active_schedules is ordered by next_execution, so keep the first one per script
+    for schedule in active_schedules:
+        summary = summaries.setdefault(schedule.script_id, {
+            'total': 0,
+            'successful': 0,
+            'success_rate': 0,
+            'last_execution': None,
+            'active_schedule': None
+        })
+        if summary['active_schedule'] is None:
+            summary['active_schedule'] = schedule
+    
+    return summaries
+
 def calculate_dashboard_stats(user_id):
     """Calculate dashboard statistics for user"""
     
@@ -64,28 +122,28 @@ def calculate_dashboard_stats(user_id):
     last_30d = now - timedelta(days=30)
     
     # Basic counts
-    total_scripts = Script.query.filter_by(user_id=user_id, is_active=True).count()
-    active_schedules = Schedule.query.join(Script)\
-        .filter(Script.user_id == user_id, Schedule.is_active == True).count()
-    
-    # Execution stats for last 24 hours
-    executions_24h = Execution.query.filter(
+    total_scripts = db.session.query(func.count(Script.id))\
+        .filter(Script.user_id == user_id, Script.is_active == True).scalar()
+    active_schedules = db.session.query(func.count(Schedule.id)).join(Script)\
+        .filter(Script.user_id == user_id, Schedule.is_active == True).scalar()
+    
+    # Execution stats for last 24 hours in one conditional aggregate
+    executions_24h, successful_24h, failed_24h = db.session.query(
+        func.count(Execution.id),
+        func.sum(case(
+            (and_(Execution.status == ExecutionStatus.COMPLETED, Execution.exit_code == 0), 1),
+            else_=0
+        )),
+        func.sum(case(
+            (Execution.status.in_([ExecutionStatus.FAILED, ExecutionStatus.TIMEOUT]), 1),
+            else_=0
+        ))
+    ).filter(
         Execution.user_id == user_id,
         Execution.started_at >= last_24h
-    ).count()
-    
-    successful_24h = Execution.query.filter(
-        Execution.user_id == user_id,
-        Execution.started_at >= last_24h,
-        Execution.status == ExecutionStatus.COMPLETED,
-        Execution.exit_code == 0
-    ).count()
-    
-    failed_24h = Execution.query.filter(
-        Execution.user_id == user_id,
-        Execution.started_at >= last_24h,
-        Execution.status.in_([ExecutionStatus.FAILED, ExecutionStatus.TIMEOUT])
-    ).count()
+    ).one()
+    successful_24h = successful_24h or 0
+    failed_24h = failed_24h or 0
     
     # Success rate
     success_rate_24h = round((successful_24h / executions_24h * 100) if executions_24h > 0 else 100, 1)
@@ -101,21 +159,42 @@ def calculate_dashboard_stats(user_id):
 
 def get_running_executions(user_id):
     """Get currently running executions for user"""
-    running_execution_ids = script_executor.get_running_executions()
+    running_ids = running_execution_ids()
     
-    if not running_execution_ids:
+    if not running_ids:
         return []
     
-    return Execution.query.filter(
-        Execution.id.in_(running_execution_ids),
+    return Execution.query.options(
+        defer(Execution.stdout),
+        defer(Execution.stderr),
+        selectinload(Execution.script)
+    ).filter(
+        Execution.id.in_(list(running_ids)),
         Execution.user_id == user_id
     ).all()
 
+# Short-lived cache of the next scheduled run; schedule writes clear it and the
+# TTL bounds staleness from bulk updates and other worker processes
+NEXT_SCHEDULED_TTL = 30  # seconds
+_next_scheduled_cache = {'value': None, 'expires_at': 0.0}
+
 def get_next_scheduled_execution():
     """Get the next scheduled execution across all users"""
-    next_schedule = Schedule.query.filter(
-        Schedule.is_active == True,
-        Schedule.next_execution.isnot(None)
-    ).order_by(Schedule.next_execution).first()
+    now = time.monotonic()
+    if _next_scheduled_cache['expires_at'] > now:
+        return _next_scheduled_cache['value']
+    
+    next_execution = db.session.query(func.min(Schedule.next_execution)).filter(
+        Schedule.is_active == True
+    ).scalar()
     
-    return next_schedule.next_execution if next_schedule else None
\ No newline at end of file
+    _next_scheduled_cache['value'] = next_execution
+    _next_scheduled_cache['expires_at'] = now + NEXT_SCHEDULED_TTL
+    return next_execution
+
+@event.listens_for(Schedule, 'after_insert')
+@event.listens_for(Schedule, 'after_update')
+@event.listens_for(Schedule, 'after_delete')
+def invalidate_next_scheduled_execution(mapper, connection, target):
+    """Drop the cached next scheduled execution when a schedule changes"""
+    _next_scheduled_cache['expires_at'] = 0.0
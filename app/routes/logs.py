@@ -2,18 +2,41 @@
 Logs Routes - Execution history and log viewing
 """
 
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, render_template, request, jsonify, current_app
 from flask_login import login_required, current_user
 from datetime import datetime, timedelta
-from sqlalchemy import and_, or_
+import hashlib
+import time
+from sqlalchemy import and_, func, case, text, event, inspect, tuple_
+from sqlalchemy.orm import selectinload, load_only
 
-from app.models.execution import Execution, ExecutionStatus, ExecutionTrigger
+from app.models.execution import Execution, ExecutionStatus, ExecutionTrigger, format_duration
 from app.models.script import Script
 from app.services.script_executor import script_executor
 from app.models import db
 
 logs_bp = Blueprint('logs', __name__)
 
+# Filter value -> enum member, built once at import
+STATUS_BY_VALUE = {s.value: s for s in ExecutionStatus}
+TRIGGER_BY_VALUE = {t.value: t for t in ExecutionTrigger}
+
+# Largest slice of stdout/stderr returned by one output poll
+OUTPUT_CHUNK_CHARS = 256 * 1024
+
+# Per-user stats page cache: user_id -> (expires_at, (stats, script_stats));
+# entries are dropped when one of the user's executions finishes
+STATS_CACHE_TTL = 120  # seconds
+_stats_cache = {}
+
+# Stats for a user without any executions, returned without running the aggregates
+EMPTY_PERIOD_STATS = {'total': 0, 'successful': 0, 'failed': 0, 'success_rate': 100}
+EMPTY_STATS = {
+    'last_24h': EMPTY_PERIOD_STATS,
+    'last_7d': EMPTY_PERIOD_STATS,
+    'last_30d': EMPTY_PERIOD_STATS
+}
+
 @logs_bp.route('/')
 @login_required
 def index():
@@ -26,7 +49,8 @@ def index():
     from_date = request.args.get('from_date', '')
     to_date = request.args.get('to_date', '')
     search = request.args.get('search', '').strip()
-    page = request.args.get('page', 1, type=int)
+    after = parse_cursor(request.args.get('after_started_at'), request.args.get('after_id', type=int))
+    before = parse_cursor(request.args.get('before_started_at'), request.args.get('before_id', type=int))
     per_page = 50
     
     # Build base query
@@ -36,49 +60,74 @@ def index():
     if script_id:
         query = query.filter_by(script_id=script_id)
     
-    if status and status in [s.value for s in ExecutionStatus]:
-        query = query.filter_by(status=ExecutionStatus(status))
+    status_enum = STATUS_BY_VALUE.get(status)
+    if status_enum:
+        query = query.filter_by(status=status_enum)
     
-    if trigger and trigger in [t.value for t in ExecutionTrigger]:
-        query = query.filter_by(trigger_type=ExecutionTrigger(trigger))
+    trigger_enum = TRIGGER_BY_VALUE.get(trigger)
+    if trigger_enum:
+        query = query.filter_by(trigger_type=trigger_enum)
     
-    # Date range filters
-    if from_date:
-        try:
-            from_dt = datetime.strptime(from_date, '%Y-%m-%d')
-            query = query.filter(Execution.started_at >= from_dt)
-        except ValueError:
-            pass
+    # Date range filters as a half-open [from, to + 1 day) range on the bare
+    # started_at column; wrapping it in DATE() would stop ix_exec_user_started
+    # from serving the range
+    from_dt = parse_date(from_date)
+    if from_dt:
+        query = query.filter(Execution.started_at >= from_dt)
     
-    if to_date:
-        try:
-            to_dt = datetime.strptime(to_date, '%Y-%m-%d') + timedelta(days=1)
-            query = query.filter(Execution.started_at < to_dt)
-        except ValueError:
-            pass
+    to_dt = parse_date(to_date)
+    if to_dt:
+        query = query.filter(Execution.started_at < to_dt + timedelta(days=1))
     
     # Search in output
     if search:
-        query = query.filter(
-            or_(
-                Execution.stdout.contains(search),
-                Execution.stderr.contains(search)
-            )
-        )
-    
-    # Order by most recent first
-    query = query.order_by(Execution.started_at.desc())
-    
-    # Paginate results
-    executions = query.paginate(
-        page=page, 
-        per_page=per_page, 
-        error_out=False
+        query = query.filter(Execution.output_search_filter(search))
+    
+    # Unfiltered listings use the planner's row estimate; otherwise count on the
+    # filtered query directly instead of a SELECT count(*) FROM (...) wrapper
+    filtered = any([script_id, status_enum, trigger_enum, from_dt, to_dt, search])
+    total = None if filtered else estimate_execution_count(query)
+    estimated_total = total is not None
+    if total is None:
+        total = query.with_entities(func.count(Execution.id)).scalar()
+    
+    # Skip the output columns and load the page's scripts in one IN() query
+    query = query.options(
+        load_only(Execution.id, Execution.status, Execution.trigger_type, Execution.started_at,
+                  Execution.completed_at, Execution.duration_seconds, Execution.exit_code,
+                  Execution.script_id),
+        selectinload(Execution.script)
+    )
+    
+    # Keyset pagination on (started_at, id), most recent first: every page is an
+    # index range scan of per_page + 1 rows no matter how deep it is
+    keyset = tuple_(Execution.started_at, Execution.id)
+    if before:
+        rows = query.filter(keyset > before)\
+            .order_by(Execution.started_at.asc(), Execution.id.asc())\
+            .limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after:
+            query = query.filter(keyset < after)
+        rows = query.order_by(Execution.started_at.desc(), Execution.id.desc())\
+            .limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_prev = after is not None
+    
+    executions = KeysetPage(
+        items=rows,
+        next_cursor=cursor_args('after', rows[-1]) if has_next and rows else None,
+        prev_cursor=cursor_args('before', rows[0]) if has_prev and rows else None,
+        total=total,
+        estimated_total=estimated_total
     )
     
     # Get user's scripts for filter dropdown
-    user_scripts = Script.query.filter_by(user_id=current_user.id, is_active=True)\
-        .order_by(Script.name).all()
+    user_scripts = Script.active_options_for_user(current_user.id)
     
     return render_template('logs/index.html',
                          executions=executions,
@@ -92,6 +141,65 @@ def index():
                              'search': search
                          })
 
+class KeysetPage:
+    """One page of a keyset-paginated listing"""
+    
+    def __init__(self, items, next_cursor, prev_cursor, total, estimated_total):
+        self.items = items
+        self.next_cursor = next_cursor  # url_for kwargs for the next page, or None
+        self.prev_cursor = prev_cursor  # url_for kwargs for the previous page, or None
+        self.has_next = next_cursor is not None
+        self.has_prev = prev_cursor is not None
+        self.total = total
+        self.estimated_total = estimated_total
+    
+    def __iter__(self):
+        return iter(self.items)
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD filter value, returning None when missing or invalid"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return None
+
+def parse_cursor(started_at, execution_id):
+    """Parse a (started_at, id) pagination cursor from query string values"""
+    if not started_at or execution_id is None:
+        return None
+    try:
+        return (datetime.fromisoformat(started_at), execution_id)
+    except ValueError:
+        return None
+
+def cursor_args(direction, execution):
+    """Query string arguments pointing past the given execution"""
+    return {
+        f'{direction}_started_at': execution.started_at.isoformat(),
+        f'{direction}_id': execution.id
+    }
+
+def estimate_execution_count(query):
+    """Estimate the row count of an executions query from the PostgreSQL planner
+    
+    Returns None on other databases so the caller falls back to an exact count.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    
+    statement = query.with_entities(Execution.id).statement.compile(
+        dialect=db.engine.dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    try:
+        plan = db.session.execute(text(f'EXPLAIN (FORMAT JSON) {statement}')).scalar()
+    except Exception:
+        return None
+    
+    return int(plan[0]['Plan']['Plan Rows'])
+
 @logs_bp.route('/execution/<int:id>')
 @login_required
 def view_execution(id):
@@ -100,7 +208,7 @@ def view_execution(id):
     execution = Execution.query.filter_by(id=id, user_id=current_user.id).first_or_404()
     
     # Check if execution is currently running
-    is_running = execution.id in script_executor.get_running_executions()
+    is_running = script_executor.is_running(execution.id, execution.status)
     
     return render_template('logs/execution_detail.html',
                          execution=execution,
@@ -132,23 +240,88 @@ def cancel_execution(id):
 def get_execution_output(id):
     """Get execution output (for AJAX updates)"""
     
-    execution = Execution.query.filter_by(id=id, user_id=current_user.id).first_or_404()
+    # Clients pass the offsets from the previous poll and only receive new output,
+    # at most OUTPUT_CHUNK_CHARS per stream per request
+    stdout_offset = max(request.args.get('since', 0, type=int), 0)
+    stderr_offset = max(request.args.get('since_stderr', 0, type=int), 0)
+    
+    row = db.session.query(
+        Execution.id,
+        Execution.status,
+        Execution.exit_code,
+        Execution.duration_seconds,
+        func.substr(Execution.stdout, stdout_offset + 1, OUTPUT_CHUNK_CHARS).label('stdout'),
+        func.length(Execution.stdout).label('stdout_length'),
+        func.substr(Execution.stderr, stderr_offset + 1, OUTPUT_CHUNK_CHARS).label('stderr'),
+        func.length(Execution.stderr).label('stderr_length')
+    ).filter(Execution.id == id, Execution.user_id == current_user.id).first_or_404()
     
-    return jsonify({
-        'status': execution.status.value,
-        'stdout': execution.stdout or '',
-        'stderr': execution.stderr or '',
-        'exit_code': execution.exit_code,
-        'duration': execution.formatted_duration,
-        'is_finished': execution.is_finished,
-        'is_running': execution.id in script_executor.get_running_executions()
-    })
+    stdout = row.stdout or ''
+    stderr = row.stderr or ''
+    next_offset = stdout_offset + len(stdout)
+    next_stderr_offset = stderr_offset + len(stderr)
+    is_running = script_executor.is_running(row.id, row.status)
+    is_finished = row.status.is_finished
+    
+    # Polls that would return exactly what the client already has get a bodyless 304
+    etag = hashlib.blake2b(
+        f'{row.status.value}|{row.stdout_length}|{row.stderr_length}|{row.exit_code}|'
+        f'{row.duration_seconds}|{is_running}|{stdout_offset}|{stderr_offset}'.encode(),
+        digest_size=8
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify({
+            'status': row.status.value,
+            'stdout': stdout,
+            'stderr': stderr,
+            'next_offset': next_offset,
+            'next_stderr_offset': next_stderr_offset,
+            'has_more': next_offset < (row.stdout_length or 0) or next_stderr_offset < (row.stderr_length or 0),
+            'exit_code': row.exit_code,
+            'duration': format_duration(row.duration_seconds),
+            'is_finished': is_finished,
+            'is_running': is_running
+        })
+    
+    response.set_etag(etag)
+    if is_finished and not is_running:
+        # Finished output never changes
+        response.headers['Cache-Control'] = 'private, max-age=3600'
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @logs_bp.route('/stats')
 @login_required
 def stats():
     """Execution statistics page"""
     
+    user_id = current_user.id
+    
+    now = time.monotonic()
+    cached = _stats_cache.get(user_id)
+    if cached and cached[0] > now:
+        stats, script_stats = cached[1]
+    else:
+        stats, script_stats = calculate_execution_stats(user_id)
+        _stats_cache[user_id] = (now + STATS_CACHE_TTL, (stats, script_stats))
+    
+    return render_template('logs/stats.html',
+                         stats=stats,
+                         script_stats=script_stats)
+
+def calculate_execution_stats(user_id):
+    """Calculate period and per-script statistics as plain data (safe to cache)"""
+    
+    # New accounts have nothing to aggregate; a single EXISTS probe answers that
+    has_executions = db.session.query(
+        db.session.query(Execution.id).filter(Execution.user_id == user_id).exists()
+    ).scalar()
+    if not has_executions:
+        return EMPTY_STATS, []
+    
     # Calculate various statistics
     now = datetime.utcnow()
     periods = {
@@ -159,26 +332,30 @@ def stats():
     
     stats = {}
     
-    for period_name, start_date in periods.items():
-        period_executions = Execution.query.filter(
-            Execution.user_id == current_user.id,
-            Execution.started_at >= start_date
-        )
-        
-        total = period_executions.count()
-        successful = period_executions.filter(
-            Execution.status == ExecutionStatus.COMPLETED,
-            Execution.exit_code == 0
-        ).count()
-        
-        failed = period_executions.filter(
-            Execution.status.in_([
-                ExecutionStatus.FAILED,
-                ExecutionStatus.TIMEOUT,
-                ExecutionStatus.CANCELLED
-            ])
-        ).count()
-        
+    # Every period's counters from one scan of the widest window, using
+    # aggregate FILTER clauses per period
+    successful_cond = and_(Execution.status == ExecutionStatus.COMPLETED, Execution.exit_code == 0)
+    failed_cond = Execution.status.in_([
+        ExecutionStatus.FAILED,
+        ExecutionStatus.TIMEOUT,
+        ExecutionStatus.CANCELLED
+    ])
+    columns = []
+    for start_date in periods.values():
+        in_period = Execution.started_at >= start_date
+        columns += [
+            func.count(Execution.id).filter(in_period),
+            func.count(Execution.id).filter(and_(in_period, successful_cond)),
+            func.count(Execution.id).filter(and_(in_period, failed_cond))
+        ]
+    
+    counters = db.session.query(*columns).filter(
+        Execution.user_id == user_id,
+        Execution.started_at >= min(periods.values())
+    ).one()
+    
+    for index, period_name in enumerate(periods):
+        total, successful, failed = counters[index * 3:index * 3 + 3]
         success_rate = round((successful / total * 100) if total > 0 else 100, 1)
         
         stats[period_name] = {
@@ -190,46 +367,55 @@ def stats():
     
     # Get execution trends by script
     script_stats = []
-    user_scripts = Script.query.filter_by(user_id=current_user.id, is_active=True).all()
+    user_scripts = Script.active_options_for_user(user_id)
+    
+    # One grouped aggregate over the last 30 days for all of the user's scripts
+    script_rows = db.session.query(
+        Execution.script_id,
+        func.count(Execution.id),
+        func.sum(case(
+            (and_(Execution.status == ExecutionStatus.COMPLETED, Execution.exit_code == 0), 1),
+            else_=0
+        )),
+        func.avg(Execution.duration_seconds)
+    ).filter(
+        Execution.user_id == user_id,
+        Execution.script_id.in_([script.id for script in user_scripts]),
+        Execution.started_at >= periods['last_30d']
+    ).group_by(Execution.script_id).all()
+    rows_by_script = {row[0]: row[1:] for row in script_rows}
     
     for script in user_scripts:
-        script_executions = Execution.query.filter(
-            Execution.script_id == script.id,
-            Execution.started_at >= periods['last_30d']
-        )
+        if script.id not in rows_by_script:
+            continue
         
-        total = script_executions.count()
-        successful = script_executions.filter(
-            Execution.status == ExecutionStatus.COMPLETED,
-            Execution.exit_code == 0
-        ).count()
-        
-        if total > 0:
-            script_stats.append({
-                'script': script,
-                'total_executions': total,
-                'success_rate': round((successful / total * 100), 1),
-                'avg_duration': calculate_avg_duration(script.id, periods['last_30d'])
-            })
+        total, successful, avg_seconds = rows_by_script[script.id]
+        script_stats.append({
+            'script': script,
+            'total_executions': total,
+            'success_rate': round(((successful or 0) / total * 100), 1),
+            'avg_duration': format_avg_duration(avg_seconds)
+        })
     
-    return render_template('logs/stats.html',
-                         stats=stats,
-                         script_stats=script_stats)
+    return stats, script_stats
 
-def calculate_avg_duration(script_id, since_date):
-    """Calculate average execution duration for a script"""
-    
-    from sqlalchemy import func
-    
-    result = db.session.query(func.avg(Execution.duration_seconds)).filter(
-        Execution.script_id == script_id,
-        Execution.started_at >= since_date,
-        Execution.duration_seconds.isnot(None)
-    ).scalar()
+@event.listens_for(Execution, 'after_update')
+def invalidate_stats_on_finish(mapper, connection, target):
+    """Drop the owner's cached stats when an execution reaches a terminal state"""
+    if target.is_finished and inspect(target).attrs.status.history.has_changes():
+        _stats_cache.pop(target.user_id, None)
+
+@event.listens_for(Execution, 'after_delete')
+def invalidate_stats_on_delete(mapper, connection, target):
+    """Drop the owner's cached stats when an execution is removed"""
+    _stats_cache.pop(target.user_id, None)
+
+def format_avg_duration(avg_seconds):
+    """Format an average execution duration in seconds"""
     
-    if result:
+    if avg_seconds:
         # Convert to human readable format
-        avg_seconds = float(result)
+        avg_seconds = float(avg_seconds)
         if avg_seconds < 60:
             return f"{avg_seconds:.1f}s"
         elif avg_seconds < 3600:
@@ -237,4 +423,4 @@ def calculate_avg_duration(script_id, since_date):
         else:
             return f"{avg_seconds/3600:.1f}h"
     
-    return "N/A"
\ No newline at end of file
+    return "N/A"
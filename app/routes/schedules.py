@@ -5,27 +5,45 @@ Schedules Routes - Schedule management and configuration
 from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
 from flask_login import login_required, current_user
 from datetime import datetime
-import json
+import re
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, defer
 
 from app.models.script import Script
 from app.models.schedule import Schedule, ScheduleFrequency
+from app.models.execution import Execution
 from app.models import db
+from app.routes import strict_loading
 
 schedules_bp = Blueprint('schedules', __name__)
 
+VALID_WEEKDAYS = frozenset(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
+# Notification email parsing: comma separators with surrounding whitespace,
+# and a deliberately loose address shape check (local@host; single-label hosts
+# such as ops@localhost are valid)
+EMAIL_SEPARATOR_RE = re.compile(r'\s*,\s*')
+EMAIL_RE = re.compile(r'[^@\s,]+@[^@\s,]+')
+
 @schedules_bp.route('/')
 @login_required
 def index():
     """Schedules list page"""
     
-    # Get user's schedules with script information
-    schedules = Schedule.query.join(Script).filter(
+    # Get user's schedules with script information (populated from the join),
+    # skipping columns the list never shows
+    schedules = strict_loading(Schedule.query.join(Script).options(
+        contains_eager(Schedule.script).load_only(Script.id, Script.name, Script.script_type),
+        defer(Schedule.notification_emails)
+    )).filter(
         Script.user_id == current_user.id
     ).order_by(Schedule.next_execution.asc()).all()
     
-    # Separate active and inactive schedules
-    active_schedules = [s for s in schedules if s.is_active]
-    inactive_schedules = [s for s in schedules if not s.is_active]
+    # Separate active and inactive schedules in one pass
+    active_schedules = []
+    inactive_schedules = []
+    for schedule in schedules:
+        (active_schedules if schedule.is_active else inactive_schedules).append(schedule)
     
     return render_template('schedules/index.html',
                          active_schedules=active_schedules,
@@ -37,83 +55,79 @@ def index():
 def create(script_id=None):
     """Create new schedule"""
     
+    user_id = current_user.id
+    
     # Get user's scripts for dropdown
-    user_scripts = Script.query.filter_by(user_id=current_user.id, is_active=True)\
-        .order_by(Script.name).all()
+    user_scripts = Script.active_options_for_user(user_id)
     
     if not user_scripts:
         flash('You must upload at least one script before creating a schedule.', 'warning')
         return redirect(url_for('scripts.upload'))
     
-    # If script_id provided, validate it belongs to user
+    # If script_id provided, validate it belongs to user (against the cached
+    # options rather than another query)
     selected_script = None
     if script_id:
-        selected_script = Script.query.filter_by(
-            id=script_id, 
-            user_id=current_user.id, 
-            is_active=True
-        ).first()
+        selected_script = next((script for script in user_scripts if script.id == script_id), None)
         if not selected_script:
             flash('Script not found.', 'error')
             return redirect(url_for('schedules.index'))
     
     if request.method == 'POST':
+        form = request.form
         try:
             # Get form data
-            name = request.form.get('name', '').strip()
-            description = request.form.get('description', '').strip()
-            target_script_id = int(request.form.get('script_id'))
-            frequency = request.form.get('frequency')
+            name = form.get('name', '').strip()
+            description = form.get('description', '').strip()
+            target_script_id = int(form.get('script_id'))
+            frequency = parse_frequency(form.get('frequency'))
             
             # Validate required fields
             if not name:
                 flash('Schedule name is required.', 'error')
                 return redirect(request.url)
             
-            if not frequency or frequency not in [f.value for f in ScheduleFrequency]:
+            if frequency is None:
                 flash('Valid frequency is required.', 'error')
                 return redirect(request.url)
             
-            # Validate script ownership
-            target_script = Script.query.filter_by(
-                id=target_script_id,
-                user_id=current_user.id,
-                is_active=True
-            ).first()
+            # Validate script ownership and check for an existing active schedule
+            # on it in one round-trip
+            target_script = db.session.query(
+                Script.name,
+                Schedule.query.filter_by(script_id=target_script_id, is_active=True).exists()
+            ).filter(
+                Script.id == target_script_id,
+                Script.user_id == user_id,
+                Script.is_active == True
+            ).one_or_none()
             
             if not target_script:
                 flash('Selected script not found.', 'error')
                 return redirect(request.url)
             
-            # Check for existing active schedule on this script
-            existing_schedule = Schedule.query.filter_by(
-                script_id=target_script_id,
-                is_active=True
-            ).first()
-            
-            if existing_schedule:
-                flash(f'Script "{target_script.name}" already has an active schedule.', 'warning')
+            script_name, has_active_schedule = target_script
+            if has_active_schedule:
+                flash(f'Script "{script_name}" already has an active schedule.', 'warning')
                 return redirect(request.url)
             
             # Build schedule configuration
-            schedule_config = build_schedule_config(frequency, request.form)
+            schedule_config = build_schedule_config(frequency, form)
             
             # Get notification settings
-            notify_on_success = bool(request.form.get('notify_on_success'))
-            notify_on_failure = bool(request.form.get('notify_on_failure'))
-            notification_emails = request.form.get('notification_emails', '').strip()
+            notify_on_success = bool(form.get('notify_on_success'))
+            notify_on_failure = bool(form.get('notify_on_failure'))
+            notification_emails = form.get('notification_emails', '').strip()
             
             # Parse email list
-            email_list = []
-            if notification_emails:
-                email_list = [email.strip() for email in notification_emails.split(',') if email.strip()]
+            email_list = parse_notification_emails(notification_emails)
             
             # Create schedule
             schedule = Schedule(
                 name=name,
                 script_id=target_script_id,
-                frequency=ScheduleFrequency(frequency),
-                schedule_config=json.dumps(schedule_config) if schedule_config else None,
+                frequency=frequency,
+                schedule_config=schedule_config,
                 description=description
             )
             
@@ -127,6 +141,11 @@ def create(script_id=None):
             flash(f'Schedule "{name}" created successfully!', 'success')
             return redirect(url_for('schedules.view', id=schedule.id))
             
+        except IntegrityError:
+            # A concurrent request activated a schedule for this script first
+            db.session.rollback()
+            flash(f'Script "{script_name}" already has an active schedule.', 'warning')
+            return redirect(request.url)
         except ValueError as e:
             flash(f'Invalid form data: {str(e)}', 'error')
             return redirect(request.url)
@@ -143,13 +162,16 @@ def create(script_id=None):
 def view(id):
     """View schedule details"""
     
-    schedule = Schedule.query.join(Script).filter(
+    schedule = strict_loading(Schedule.query.join(Script).options(contains_eager(Schedule.script))).filter(
         Schedule.id == id,
         Script.user_id == current_user.id
     ).first_or_404()
     
     # Get recent executions for this schedule
-    recent_executions = schedule.executions[:10]  # Last 10 executions
+    recent_executions = Execution.query.options(defer(Execution.stdout), defer(Execution.stderr))\
+        .filter_by(schedule_id=schedule.id)\
+        .order_by(Execution.started_at.desc())\
+        .limit(10).all()  # Last 10 executions
     
     return render_template('schedules/view.html',
                          schedule=schedule,
@@ -160,34 +182,31 @@ def view(id):
 def edit(id):
     """Edit schedule"""
     
-    schedule = Schedule.query.join(Script).filter(
+    schedule = strict_loading(Schedule.query.join(Script).options(contains_eager(Schedule.script))).filter(
         Schedule.id == id,
         Script.user_id == current_user.id
     ).first_or_404()
     
     if request.method == 'POST':
+        form = request.form
         try:
             # Update basic info
-            schedule.name = request.form.get('name', '').strip()
-            schedule.description = request.form.get('description', '').strip()
+            schedule.name = form.get('name', '').strip()
+            schedule.description = form.get('description', '').strip()
             
             # Update frequency and config
-            frequency = request.form.get('frequency')
-            if frequency and frequency in [f.value for f in ScheduleFrequency]:
-                schedule.frequency = ScheduleFrequency(frequency)
-                schedule_config = build_schedule_config(frequency, request.form)
+            frequency = parse_frequency(form.get('frequency'))
+            if frequency is not None:
+                schedule.frequency = frequency
+                schedule_config = build_schedule_config(frequency, form)
                 schedule.config_dict = schedule_config
             
             # Update notification settings
-            schedule.notify_on_success = bool(request.form.get('notify_on_success'))
-            schedule.notify_on_failure = bool(request.form.get('notify_on_failure'))
+            schedule.notify_on_success = bool(form.get('notify_on_success'))
+            schedule.notify_on_failure = bool(form.get('notify_on_failure'))
             
-            notification_emails = request.form.get('notification_emails', '').strip()
-            if notification_emails:
-                email_list = [email.strip() for email in notification_emails.split(',') if email.strip()]
-                schedule.notification_email_list = email_list
-            else:
-                schedule.notification_email_list = []
+            notification_emails = form.get('notification_emails', '').strip()
+            schedule.notification_email_list = parse_notification_emails(notification_emails)
             
             # Recalculate next execution
             schedule.update_next_execution()
@@ -206,7 +225,7 @@ def edit(id):
 def toggle_active(id):
     """Toggle schedule active status"""
     
-    schedule = Schedule.query.join(Script).filter(
+    schedule = strict_loading(Schedule.query.join(Script)).filter(
         Schedule.id == id,
         Script.user_id == current_user.id
     ).first_or_404()
@@ -217,6 +236,9 @@ def toggle_active(id):
         status = "activated" if schedule.is_active else "deactivated"
         flash(f'Schedule "{schedule.name}" {status} successfully!', 'success')
         
+    except IntegrityError:
+        db.session.rollback()
+        flash('This script already has an active schedule.', 'warning')
     except Exception as e:
         flash(f'Error toggling schedule: {str(e)}', 'error')
     
@@ -244,67 +266,76 @@ def delete(id):
     
     return redirect(url_for('schedules.index'))
 
+def parse_notification_emails(value):
+    """Split a comma-separated email list, raising ValueError on a malformed address"""
+    emails = [email for email in EMAIL_SEPARATOR_RE.split(value.strip()) if email]
+    for email in emails:
+        if not EMAIL_RE.fullmatch(email):
+            raise ValueError(f'Invalid notification email: {email}')
+    return emails
+
+def parse_frequency(value):
+    """Coerce a submitted frequency to ScheduleFrequency, or None if missing or unknown"""
+    try:
+        return ScheduleFrequency(value)
+    except ValueError:
+        return None
+
 def build_schedule_config(frequency, form_data):
     """Build schedule configuration dictionary from form data"""
     
-    config = {}
+    # Hourly (and anything unknown) doesn't need additional config
+    builder = SCHEDULE_CONFIG_BUILDERS.get(frequency)
+    return builder(form_data) if builder else {}
+
+def with_start_date(config, form_data):
+    """Add the optional start_date field to a schedule config"""
+    start_date = form_data.get('start_date', '')
+    if start_date:
+        config['start_date'] = start_date
+    return config
+
+def build_daily_config(form_data):
+    """Daily: run time"""
+    return with_start_date({'time': form_data.get('time', '00:00')}, form_data)
+
+def build_weekly_config(form_data):
+    """Weekly: run time and selected weekdays (Monday when none are valid)"""
+    selected_days = [day for day in form_data.getlist('days') if day in VALID_WEEKDAYS]
     
-    if frequency == ScheduleFrequency.DAILY.value:
-        time = form_data.get('time', '00:00')
-        start_date = form_data.get('start_date', '')
-        config['time'] = time
-        if start_date:
-            config['start_date'] = start_date
-        
-    elif frequency == ScheduleFrequency.WEEKLY.value:
-        time = form_data.get('time', '00:00')
-        start_date = form_data.get('start_date', '')
-        days = form_data.getlist('days')
-        
-        # Validate days
-        valid_days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        selected_days = [day for day in days if day in valid_days]
-        
-        if not selected_days:
-            selected_days = ['Monday']  # Default to Monday
-        
-        config['time'] = time
-        config['days'] = selected_days
-        if start_date:
-            config['start_date'] = start_date
-        
-    elif frequency == ScheduleFrequency.MONTHLY.value:
-        time = form_data.get('time', '00:00')
-        start_date = form_data.get('start_date', '')
-        day = int(form_data.get('day', 1))
-        
-        # Validate day (1-31)
-        if day < 1 or day > 31:
-            day = 1
-        
-        config['time'] = time
-        config['day'] = day
-        if start_date:
-            config['start_date'] = start_date
-        
-    elif frequency == ScheduleFrequency.INTERVAL.value:
-        interval_minutes = form_data.get('interval_minutes', '15')
-        time = form_data.get('time', '09:00')
-        start_date = form_data.get('start_date', '')
-        
-        # Validate interval minutes
-        try:
-            interval_minutes = int(interval_minutes)
-            if interval_minutes <= 0:
-                interval_minutes = 15
-        except (ValueError, TypeError):
-            interval_minutes = 15
-        
-        config['interval_minutes'] = interval_minutes
-        config['time'] = time
-        if start_date:
-            config['start_date'] = start_date
+    return with_start_date({
+        'time': form_data.get('time', '00:00'),
+        'days': selected_days or ['Monday']
+    }, form_data)
+
+def build_monthly_config(form_data):
+    """Monthly: run time and day of month (1-31, default 1)"""
+    day = int(form_data.get('day', 1))
+    if day < 1 or day > 31:
+        day = 1
     
-    # Hourly doesn't need additional config
+    return with_start_date({
+        'time': form_data.get('time', '00:00'),
+        'day': day
+    }, form_data)
+
+def build_interval_config(form_data):
+    """Interval: minutes between runs (default 15) and anchor time"""
+    try:
+        interval_minutes = int(form_data.get('interval_minutes', '15'))
+        if interval_minutes <= 0:
+            interval_minutes = 15
+    except (ValueError, TypeError):
+        interval_minutes = 15
     
-    return config
\ No newline at end of file
+    return with_start_date({
+        'interval_minutes': interval_minutes,
+        'time': form_data.get('time', '09:00')
+    }, form_data)
+
+SCHEDULE_CONFIG_BUILDERS = {
+    ScheduleFrequency.DAILY: build_daily_config,
+    ScheduleFrequency.WEEKLY: build_weekly_config,
+    ScheduleFrequency.MONTHLY: build_monthly_config,
+    ScheduleFrequency.INTERVAL: build_interval_config,
+}
\ No newline at end of file
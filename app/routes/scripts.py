@@ -2,22 +2,52 @@
 Scripts Routes - Script upload, management, and execution
 """
 
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, current_app, send_file
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import event
+from sqlalchemy.orm import defer
 
-from app.models.script import Script
+from app.models.script import Script, ScriptListItem, UPLOAD_CHUNK_SIZE
+from app.models.schedule import Schedule
 from app.models.execution import Execution, ExecutionTrigger
 from app.services.script_executor import script_executor
 from app.models import db
+from app.routes import strict_loading
 # UI Version Manager removed - using V2 templates only
 
 scripts_bp = Blueprint('scripts', __name__)
 
 ALLOWED_EXTENSIONS = {'py', 'bat'}
 
+# Text mimetypes for downloads, so a compressing front-end server (e.g. nginx
+# gzip_types) recognises scripts as compressible
+SCRIPT_MIMETYPES = {'py': 'text/x-python', 'bat': 'text/plain', 'sql': 'text/plain'}
+
+# Look-back window of each date filter ('today' starts at local midnight instead)
+DATE_FILTER_DAYS = {'today': 0, 'week': 7, 'month': 30}
+
+# Per-user scripts list cache: user_id -> {filter args: (expires_at, [ScriptListItem])};
+# script writes drop the owner's entries and the TTL bounds execution counter drift.
+# Both levels are kept in LRU order and capped so arbitrary filter values cannot grow it.
+SCRIPT_LIST_CACHE_TTL = 30  # seconds
+SCRIPT_LIST_CACHE_USERS = 256  # users with cached lists
+SCRIPT_LIST_CACHE_PER_USER = 16  # filter combinations cached per user
+_script_list_cache = OrderedDict()
+_script_list_lock = threading.Lock()  # guards _script_list_cache
+
+@scripts_bp.record_once
+def ensure_upload_folder(state):
+    """Create the upload directory once when the blueprint is registered"""
+    os.makedirs(state.app.config['UPLOAD_FOLDER'], exist_ok=True)
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -26,8 +56,6 @@ def allowed_file(filename):
 @login_required
 def index():
     """Scripts list page"""
-    from datetime import datetime, timedelta
-    from sqlalchemy import desc, asc, func
     
     # Get filters from query parameters
     search = request.args.get('search', '').strip()
@@ -36,16 +64,66 @@ def index():
     date_filter = request.args.get('date', '')
     sort_by = request.args.get('sort', 'updated')
     
-    # Build query
-    query = Script.query.filter_by(user_id=current_user.id, is_active=True)
+    scripts = list_scripts(current_user.id, search, script_type, size_filter, date_filter, sort_by)
+    
+    return render_template('scripts.html', 
+                         scripts=scripts,
+                         search=search,
+                         script_type=script_type,
+                         size_filter=size_filter,
+                         date_filter=date_filter,
+                         sort_by=sort_by)
+
+def list_scripts(user_id, search, script_type, size_filter, date_filter, sort_by):
+    """Filtered script list for the index page, cached per user and filter combination"""
+    # Free-text searches change with every keystroke and are rarely repeated
+    if search:
+        return query_scripts(user_id, search, script_type, size_filter, date_filter, sort_by)
+    
+    key = (script_type, size_filter, date_filter, sort_by)
+    now = time.monotonic()
+    with _script_list_lock:
+        user_cache = _script_list_cache.get(user_id)
+        cached = user_cache.get(key) if user_cache else None
+        if cached and cached[0] > now:
+            _script_list_cache.move_to_end(user_id)
+            user_cache.move_to_end(key)
+            return cached[1]
+    
+    scripts = query_scripts(user_id, search, script_type, size_filter, date_filter, sort_by)
+    
+    with _script_list_lock:
+        user_cache = _script_list_cache.setdefault(user_id, OrderedDict())
+        _script_list_cache.move_to_end(user_id)
+        
+        # Drop expired filter combinations before adding this one
+        for expired in [k for k, (expires_at, _) in user_cache.items() if expires_at <= now]:
+            del user_cache[expired]
+        user_cache[key] = (now + SCRIPT_LIST_CACHE_TTL, scripts)
+        
+        while len(user_cache) > SCRIPT_LIST_CACHE_PER_USER:
+            user_cache.popitem(last=False)
+        while len(_script_list_cache) > SCRIPT_LIST_CACHE_USERS:
+            _script_list_cache.popitem(last=False)
+    return scripts
+
+def query_scripts(user_id, search, script_type, size_filter, date_filter, sort_by):
+    """Run the scripts list query, returning detached ScriptListItem rows"""
+    from sqlalchemy import desc, asc
+    
+    # Build query, selecting only the columns the list cards render
+    query = db.session.query(*ScriptListItem.columns()).filter(
+        Script.user_id == user_id,
+        Script.is_active == True
+    )
     
     # Search filter
     if search:
-        query = query.filter(Script.name.contains(search))
+        query = query.filter(Script.name_search_filter(search))
     
     # Type filter
     if script_type and script_type in ALLOWED_EXTENSIONS:
-        query = query.filter_by(script_type=script_type)
+        query = query.filter(Script.script_type == script_type)
     
     # Size filter
     if size_filter:
@@ -57,17 +135,9 @@ def index():
             query = query.filter(Script.file_size > 10240)  # > 10KB
     
     # Date filter
-    if date_filter:
-        now = datetime.now()
-        if date_filter == 'today':
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            query = query.filter(Script.updated_at >= start_date)
-        elif date_filter == 'week':
-            start_date = now - timedelta(days=7)
-            query = query.filter(Script.updated_at >= start_date)
-        elif date_filter == 'month':
-            start_date = now - timedelta(days=30)
-            query = query.filter(Script.updated_at >= start_date)
+    if date_filter in DATE_FILTER_DAYS:
+        start_date = date_filter_start(date_filter, int(time.time() // 60))
+        query = query.filter(Script.updated_at >= start_date)
     
     # Sorting
     if sort_by == 'name':
@@ -75,26 +145,36 @@ def index():
     elif sort_by == 'size':
         query = query.order_by(desc(Script.file_size))
     elif sort_by == 'executions':
-        # Join with executions to count
-        query = query.outerjoin(Execution).group_by(Script.id).order_by(desc(func.count(Execution.id)))
+        # Counter column maintained by Execution events, no join or grouping
+        query = query.order_by(desc(Script.executions_total))
     else:  # default to 'updated'
         query = query.order_by(desc(Script.updated_at))
     
-    scripts = query.all()
-    
-    return render_template('scripts.html', 
-                         scripts=scripts,
-                         search=search,
-                         script_type=script_type,
-                         size_filter=size_filter,
-                         date_filter=date_filter,
-                         sort_by=sort_by)
+    return [ScriptListItem(*row) for row in query]
+
+@lru_cache(maxsize=32)
+def date_filter_start(date_filter, minute_key):
+    """Lower updated_at bound for a date filter, shared by all requests in the same minute"""
+    now = datetime.fromtimestamp(minute_key * 60)
+    if date_filter == 'today':
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return now - timedelta(days=DATE_FILTER_DAYS[date_filter])
+
+@event.listens_for(Script, 'after_insert')
+@event.listens_for(Script, 'after_update')
+@event.listens_for(Script, 'after_delete')
+def invalidate_script_list(mapper, connection, target):
+    """Drop the owner's cached script lists when one of their scripts changes"""
+    with _script_list_lock:
+        _script_list_cache.pop(target.user_id, None)
 
 @scripts_bp.route('/upload', methods=['GET', 'POST'])
 @login_required
 def upload():
     """Script upload page"""
     
+    user_id = current_user.id
+    
     if request.method == 'POST':
         # Check if file is in request
         if 'file' not in request.files:
@@ -119,7 +199,7 @@ def upload():
             name = file.filename.rsplit('.', 1)[0]  # Use filename without extension
         
         # Check for duplicate names
-        existing = Script.query.filter_by(user_id=current_user.id, name=name, is_active=True).first()
+        existing = Script.query.filter_by(user_id=user_id, name=name, is_active=True).first()
         if existing:
             flash(f'A script named "{name}" already exists.', 'error')
             return redirect(request.url)
@@ -130,18 +210,19 @@ def upload():
         
         # Create unique filename with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_filename = f"{current_user.id}_{timestamp}_{filename}"
+        unique_filename = f"{user_id}_{timestamp}_{filename}"
         
-        # Ensure upload directory exists
-        upload_dir = current_app.config['UPLOAD_FOLDER']
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        file_path = os.path.join(upload_dir, unique_filename)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
         
         try:
-            # Save file
-            file.save(file_path)
-            file_size = os.path.getsize(file_path)
+            # Stream the upload to disk, measuring and hashing it in the same pass
+            digest = hashlib.sha256()
+            file_size = 0
+            with open(file_path, 'wb') as saved:
+                while chunk := file.stream.read(UPLOAD_CHUNK_SIZE):
+                    saved.write(chunk)
+                    digest.update(chunk)
+                    file_size += len(chunk)
             
             # Create script record
             script = Script(
@@ -150,8 +231,9 @@ def upload():
                 filename=filename,
                 file_path=file_path,
                 script_type=script_type,
-                user_id=current_user.id,
-                file_size=file_size
+                user_id=user_id,
+                file_size=file_size,
+                content_sha256=digest.hexdigest()
             )
             
             db.session.add(script)
@@ -162,8 +244,10 @@ def upload():
             
         except Exception as e:
             # Clean up file if database save failed
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
             
             flash(f'Error uploading script: {str(e)}', 'error')
             return redirect(request.url)
@@ -178,7 +262,8 @@ def view(id):
     script = Script.query.filter_by(id=id, user_id=current_user.id, is_active=True).first_or_404()
     
     # Get recent executions
-    recent_executions = Execution.query.filter_by(script_id=script.id)\
+    recent_executions = Execution.query.options(defer(Execution.stdout), defer(Execution.stderr))\
+        .filter_by(script_id=script.id)\
         .order_by(Execution.started_at.desc())\
         .limit(10).all()
     
@@ -191,12 +276,14 @@ def view(id):
 def execute(id):
     """Execute script manually"""
     
-    script = Script.query.filter_by(id=id, user_id=current_user.id, is_active=True).first_or_404()
+    user_id = current_user.id
+    
+    script = Script.query.filter_by(id=id, user_id=user_id, is_active=True).first_or_404()
     
     try:
         execution = script_executor.execute_script(
             script_id=script.id,
-            user_id=current_user.id,
+            user_id=user_id,
             trigger_type=ExecutionTrigger.MANUAL
         )
         
@@ -212,7 +299,9 @@ def execute(id):
 def edit(id):
     """Edit script metadata"""
     
-    script = Script.query.filter_by(id=id, user_id=current_user.id, is_active=True).first_or_404()
+    user_id = current_user.id
+    
+    script = Script.query.filter_by(id=id, user_id=user_id, is_active=True).first_or_404()
     
     if request.method == 'POST':
         name = request.form.get('name', '').strip()
@@ -225,7 +314,7 @@ def edit(id):
         
         # Check for duplicate names (excluding current script)
         existing = Script.query.filter(
-            Script.user_id == current_user.id,
+            Script.user_id == user_id,
             Script.name == name,
             Script.is_active == True,
             Script.id != script.id
@@ -252,17 +341,15 @@ def edit(id):
 def delete(id):
     """Delete script"""
     
-    script = Script.query.filter_by(id=id, user_id=current_user.id, is_active=True).first_or_404()
+    script = strict_loading(Script.query).filter_by(id=id, user_id=current_user.id, is_active=True).first_or_404()
     
     try:
         # Deactivate script (soft delete)
         script.is_active = False
         script.updated_at = datetime.utcnow()
         
-        # Deactivate any active schedules
-        for schedule in script.schedules:
-            if schedule.is_active:
-                schedule.is_active = False
+        # Deactivate any active schedules in one UPDATE
+        Schedule.deactivate_for_script(script.id)
         
         db.session.commit()
         
@@ -287,8 +374,13 @@ def download(id):
         flash('Script file not found.', 'error')
         return redirect(url_for('scripts.view', id=script.id))
     
+    # Conditional so repeat downloads revalidate to a bodyless 304; honours
+    # Range requests and USE_X_SENDFILE handoff to the front-end server
     return send_file(
         script.file_path,
         as_attachment=True,
-        download_name=script.filename
+        download_name=script.filename,
+        mimetype=SCRIPT_MIMETYPES.get(script.script_type, 'text/plain'),
+        conditional=True,
+        max_age=0
     )
\ No newline at end of file
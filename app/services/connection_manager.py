@@ -3,10 +3,17 @@ Connection Manager Service - Handles database connections for Integration featur
 """
 
 import logging
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, create_engine, text
 from sqlalchemy.pool import QueuePool
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import OrderedDict, namedtuple
+from itertools import groupby
+from operator import itemgetter
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+import re
+import threading
 import time
 
 # DataSource model is imported from the main application
@@ -14,14 +21,106 @@ import time
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Leading keyword of a statement, read without stripping or upper-casing the query
+FIRST_KEYWORD_RE = re.compile(r'\s*([A-Za-z]+)')
+
+# Statements a load query may start with
+LOAD_STATEMENTS = frozenset(['INSERT', 'UPDATE', 'MERGE', 'UPSERT'])
+
+def first_keyword(query: str) -> str:
+    """Upper-cased first word of a query ('' if it does not start with one)"""
+    match = FIRST_KEYWORD_RE.match(query)
+    return match.group(1).upper() if match else ''
+
+# Statements each query type may not contain, matched as whole words in one pass
+# (so column names like CREATED_AT or UPDATE_TS are not flagged)
+EXTRACT_FORBIDDEN_OPS = ('DROP', 'DELETE', 'INSERT', 'UPDATE', 'CREATE', 'ALTER', 'TRUNCATE', 'EXECUTE')
+LOAD_FORBIDDEN_OPS = ('DROP', 'CREATE', 'ALTER', 'TRUNCATE', 'EXECUTE')
+EXTRACT_FORBIDDEN_RE = re.compile(r'\b(' + '|'.join(EXTRACT_FORBIDDEN_OPS) + r')\b', re.IGNORECASE)
+LOAD_FORBIDDEN_RE = re.compile(r'\b(' + '|'.join(LOAD_FORBIDDEN_OPS) + r')\b', re.IGNORECASE)
+
+# Comment markers and extended procedure prefixes, matched anywhere in the query
+INJECTION_PATTERNS = ('--', '/*', '*/', ';--', 'xp_', 'sp_')
+INJECTION_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(pattern) for pattern in INJECTION_PATTERNS) + '))',  # overlapping
+    re.IGNORECASE
+)
+
+def forbidden_matches(pattern, query, candidates):
+    """Distinct candidates found by pattern in query, in candidate order"""
+    found = {match.upper() for match in pattern.findall(query)}
+    return [candidate for candidate in candidates if candidate.upper() in found]
+
+@lru_cache(maxsize=4096)
+def _validate_query(query: str, query_type: str) -> Tuple[bool, tuple]:
+    """Validate a query (memoised: the result depends only on the SQL text and type)"""
+    errors = []
+    
+    if not query or query.isspace():
+        errors.append("Query cannot be empty")
+        return False, tuple(errors)
+    
+    keyword = first_keyword(query)
+    
+    if query_type == 'extract':
+        # Extract queries should be SELECT only
+        if keyword != 'SELECT':
+            errors.append("Extract queries must start with SELECT")
+        
+        # Check for dangerous operations
+        for op in forbidden_matches(EXTRACT_FORBIDDEN_RE, query, EXTRACT_FORBIDDEN_OPS):
+            errors.append(f"Extract queries cannot contain {op} operations")
+    
+    elif query_type == 'load':
+        # Load queries should be INSERT, UPDATE, MERGE, or UPSERT
+        if keyword not in LOAD_STATEMENTS:
+            errors.append("Load queries must start with INSERT, UPDATE, MERGE, or UPSERT")
+        
+        # Check for dangerous operations
+        for op in forbidden_matches(LOAD_FORBIDDEN_RE, query, LOAD_FORBIDDEN_OPS):
+            errors.append(f"Load queries cannot contain {op} operations")
+    
+    # Check for SQL injection patterns
+    found = {match.lower() for match in INJECTION_RE.findall(query)}
+    for pattern in INJECTION_PATTERNS:
+        if pattern in found:
+            errors.append(f"Query contains potentially unsafe pattern: {pattern}")
+    
+    return len(errors) == 0, tuple(errors)
+
+# Prebuilt per-db_type probes, so pings skip building a text() clause each call
+PING_SQL = {
+    'oracle': text("SELECT 1 FROM DUAL"),
+    'postgres': text("SELECT 1"),
+}
+STATUS_SQL = {
+    'oracle': text("SELECT 'OK' as status FROM DUAL"),
+    'postgres': text("SELECT 'OK' as status"),
+}
+
+# Cached engine with the datasource fields the manager needs, captured when the
+# engine is built so later calls skip the app-database lookup
+PooledDataSource = namedtuple('PooledDataSource', ['engine', 'db_type', 'name'])
+
 class ConnectionManager:
     """Manages database connections for Integration ETL operations"""
     
     def __init__(self):
-        self._connection_pools = {}  # datasource_id -> engine mapping
+        self._connection_pools = {}  # datasource_id -> PooledDataSource mapping
+        self._pool_lock = threading.Lock()  # guards _builder_locks and close_all_connections' swap
+        self._builder_locks = {}  # datasource_id -> lock held while its engine is built
         self.max_pool_size = 5
         self.pool_timeout = 30
         self.connection_timeout = 10
+        self.pool_recycle = 1800  # seconds before a pooled connection is replaced
+        self.warm_timeout = 30  # seconds to wait for pool warm-up connections
+        self.fetch_batch_size = 10000  # rows per server-side cursor fetch
+        self._statement_cache = OrderedDict()  # SQL string -> compiled text() clause, LRU order
+        self._statement_lock = threading.Lock()  # guards _statement_cache
+        self.statement_cache_size = 256
+        self._table_info_cache = {}  # (datasource_id, lower-cased table name) -> (expires_at, info)
+        self._table_info_lock = threading.Lock()  # guards _table_info_cache
+        self.table_info_ttl = 300  # seconds table metadata is reused
         self._DataSource = None  # Will be set during app initialization
     
     def set_datasource_model(self, DataSource):
@@ -30,9 +129,36 @@ class ConnectionManager:
         
     def get_engine(self, datasource_id: int):
         """Get SQLAlchemy engine for datasource (with connection pooling)"""
-        if datasource_id in self._connection_pools:
-            return self._connection_pools[datasource_id]
+        return self.get_pooled(datasource_id).engine
+    
+    def get_pooled(self, datasource_id: int, warm: bool = True) -> PooledDataSource:
+        """Get the cached engine, db_type and name for a datasource, building the engine on first use"""
+        # Lock-free fast path once the engine exists
+        pooled = self._connection_pools.get(datasource_id)
+        if pooled is not None:
+            return pooled
         
+        with self._pool_lock:
+            builder_lock = self._builder_locks.setdefault(datasource_id, threading.Lock())
+        
+        # Only one thread builds a given datasource's engine; the others wait and
+        # pick up the published engine on the re-check
+        with builder_lock:
+            pooled = self._connection_pools.get(datasource_id)
+            if pooled is None:
+                pooled = self._create_engine(datasource_id, warm)
+            return pooled
+    
+    def invalidate(self, datasource_id: int):
+        """Drop and dispose a datasource's cached engine (after its settings change)"""
+        self.invalidate_table_cache(datasource_id)
+        pooled = self._connection_pools.pop(datasource_id, None)
+        if pooled is not None:
+            pooled.engine.dispose()
+            logger.info(f"Closed connection pool for DataSource {pooled.name}")
+    
+    def _create_engine(self, datasource_id: int, warm: bool = True):
+        """Create and publish the engine for a datasource"""
         datasource = self._DataSource.query.get(datasource_id)
         if not datasource:
             raise ValueError(f"DataSource {datasource_id} not found")
@@ -47,34 +173,126 @@ class ConnectionManager:
             else:  # oracle
                 connect_args = {'timeout': self.connection_timeout}
             
-            # Create engine with connection pooling
+            # Create engine with connection pooling; connections are pinged on
+            # checkout instead of testing the engine here on the request thread
             engine = create_engine(
                 datasource.connection_string,
                 poolclass=QueuePool,
                 pool_size=self.max_pool_size,
                 max_overflow=10,
                 pool_timeout=self.pool_timeout,
+                pool_pre_ping=True,
+                pool_recycle=self.pool_recycle,
                 connect_args=connect_args,
                 echo=False  # Set to True for SQL debugging
             )
             
-            # Test connection
-            with engine.connect() as conn:
-                if datasource.db_type == 'oracle':
-                    conn.execute(text("SELECT 1 FROM DUAL"))
-                else:  # postgres
-                    conn.execute(text("SELECT 1"))
-            
             # Store in pool cache
-            self._connection_pools[datasource_id] = engine
+            pooled = PooledDataSource(engine, datasource.db_type, datasource.name)
+            self._connection_pools[datasource_id] = pooled
             logger.info(f"Created connection pool for DataSource {datasource.name}")
             
-            return engine
+            # Open the rest of the pool off the request path
+            if warm:
+                threading.Thread(target=self._warm_engine, args=(engine, datasource.db_type), daemon=True).start()
+            
+            return pooled
             
         except Exception as e:
             logger.error(f"Failed to create connection pool for DataSource {datasource.name}: {e}")
             raise ConnectionError(f"Cannot connect to {datasource.name}: {str(e)}")
     
+    def warm_pool(self, datasource_id: int, n: Optional[int] = None) -> int:
+        """
+        Open a datasource's pooled connections ahead of the first jobs
+        
+        Args:
+            datasource_id: DataSource ID
+            n: Number of connections to open (defaults to the pool size)
+            
+        Returns:
+            Number of connections that answered the ping
+        """
+        pooled = self.get_pooled(datasource_id)
+        return self._warm_engine(pooled.engine, pooled.db_type, n)
+    
+    def warm_all(self, min_idle: int = 2) -> Dict[int, int]:
+        """
+        Open min_idle connections for every active datasource, all datasources
+        in parallel (needs an app context)
+        
+        Returns:
+            Dict of datasource_id -> connections that answered the ping
+        """
+        # Engines are built here, inside the app context; only the connecting
+        # happens on the worker threads
+        pools = {}
+        for datasource in self._DataSource.query.filter_by(is_active=True).all():
+            try:
+                pools[datasource.id] = self.get_pooled(datasource.id, warm=False)
+            except Exception as e:
+                logger.warning(f"Could not warm connection pool for DataSource {datasource.name}: {e}")
+        
+        if not pools:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=len(pools)) as executor:
+            futures = {
+                datasource_id: executor.submit(self._warm_engine, pooled.engine, pooled.db_type, min_idle)
+                for datasource_id, pooled in pools.items()
+            }
+        
+        warmed = {datasource_id: future.result() for datasource_id, future in futures.items()}
+        logger.info(f"Warmed connection pools for {len(warmed)} datasources")
+        return warmed
+    
+    def _warm_engine(self, engine, db_type: str, n: Optional[int] = None) -> int:
+        """Check out n connections at once, ping each and return them to the pool"""
+        n = n or self.max_pool_size
+        ping = PING_SQL[db_type]
+        # Every worker holds its connection until all have connected, so the pool
+        # really opens n distinct connections instead of reusing the first one
+        barrier = threading.Barrier(n, timeout=self.warm_timeout)
+        
+        def open_connection():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(ping)
+                    barrier.wait()
+            except threading.BrokenBarrierError:
+                pass  # Another connection failed; this one still answered
+            except Exception:
+                barrier.abort()  # Release the workers waiting on this one
+                raise
+        
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            futures = [executor.submit(open_connection) for _ in range(n)]
+            wait(futures)
+        
+        warmed = 0
+        for future in futures:
+            if future.exception() is None:
+                warmed += 1
+            else:
+                logger.warning(f"Connection pool warm-up ping failed: {future.exception()}")
+        logger.debug(f"Warmed {warmed}/{n} pooled connections")
+        return warmed
+    
+    def _statement(self, query: str):
+        """Cached text() clause for a query, so repeated load statements are parsed once"""
+        with self._statement_lock:
+            statement = self._statement_cache.get(query)
+            if statement is not None:
+                self._statement_cache.move_to_end(query)
+                return statement
+        
+        statement = text(query)
+        with self._statement_lock:
+            self._statement_cache[query] = statement
+            if len(self._statement_cache) > self.statement_cache_size:
+                self._statement_cache.popitem(last=False)
+        return statement
+    
     @contextmanager
     def get_connection(self, datasource_id: int):
         """Get database connection with automatic cleanup"""
@@ -83,7 +301,6 @@ class ConnectionManager:
         
         try:
             connection = engine.connect()
-            logger.debug(f"Opened connection to DataSource {datasource_id}")
             yield connection
             
         except Exception as e:
@@ -99,7 +316,6 @@ class ConnectionManager:
             if connection:
                 try:
                     connection.close()
-                    logger.debug(f"Closed connection to DataSource {datasource_id}")
                 except:
                     pass
     
@@ -119,26 +335,27 @@ class ConnectionManager:
         
         with self.get_connection(datasource_id) as conn:
             try:
+                is_select = first_keyword(query) == 'SELECT'
+                statement = self._statement(query)
+                if is_select:
+                    # Server-side cursor fetched in batches, so the driver never
+                    # buffers the whole extract next to the converted rows
+                    statement = statement.execution_options(yield_per=self.fetch_batch_size)
+                
                 # Execute query
                 if params:
-                    result = conn.execute(text(query), params)
+                    result = conn.execute(statement, params)
                 else:
-                    result = conn.execute(text(query))
+                    result = conn.execute(statement)
                 
                 # Fetch results for SELECT queries
-                if query.strip().upper().startswith('SELECT'):
-                    rows = result.fetchall()
-                    
-                    # Convert to list of dictionaries
+                if is_select:
+                    # Convert each fetched batch to dictionaries before the next
+                    # one is read, so only one batch of raw rows is alive at a time
+                    columns = list(result.keys())
                     results = []
-                    if rows:
-                        columns = result.keys()
-                        results = [dict(zip(columns, row)) for row in rows]
-                    
-                    execution_time = time.time() - start_time
-                    logger.info(f"Query executed successfully: {len(results)} rows in {execution_time:.2f}s")
-                    
-                    return results, len(results)
+                    for batch in result.partitions():
+                        results.extend(dict(zip(columns, row)) for row in batch)
                     
                 else:
                     # For INSERT/UPDATE/DELETE queries
@@ -146,7 +363,8 @@ class ConnectionManager:
                     rows_affected = result.rowcount
                     
                     execution_time = time.time() - start_time
-                    logger.info(f"Query executed successfully: {rows_affected} rows affected in {execution_time:.2f}s")
+                    logger.info("Query executed successfully on DataSource %s: %d rows affected in %.2fs",
+                                datasource_id, rows_affected, execution_time)
                     
                     return [], rows_affected
                     
@@ -155,19 +373,59 @@ class ConnectionManager:
                 execution_time = time.time() - start_time
                 logger.error(f"Query execution failed after {execution_time:.2f}s: {e}")
                 raise
+        
+        execution_time = time.time() - start_time
+        logger.info("Query executed successfully on DataSource %s: %d rows in %.2fs",
+                    datasource_id, len(results), execution_time)
+        
+        return results, len(results)
+    
+    def execute_many(self, datasource_id: int, query: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Execute a load statement once per parameter set in a single executemany call
+        
+        Args:
+            datasource_id: DataSource ID
+            query: SQL statement to execute
+            rows: One parameter dict per execution
+            
+        Returns:
+            Number of rows affected
+        """
+        if not rows:
+            return 0
+        
+        start_time = time.time()
+        
+        with self.get_connection(datasource_id) as conn:
+            try:
+                # A list of parameter dicts takes the driver's executemany path,
+                # batching the rows instead of one round trip per row
+                result = conn.execute(self._statement(query), rows)
+                conn.commit()
+                
+                # Some drivers do not report a total for executemany
+                rows_affected = result.rowcount if result.rowcount >= 0 else len(rows)
+                
+                execution_time = time.time() - start_time
+                logger.info("Batch executed successfully on DataSource %s: %d rows affected in %.2fs",
+                            datasource_id, rows_affected, execution_time)
+                
+                return rows_affected
+                
+            except Exception as e:
+                conn.rollback()
+                execution_time = time.time() - start_time
+                logger.error(f"Batch execution failed after {execution_time:.2f}s: {e}")
+                raise
     
     def test_connection(self, datasource_id: int) -> Tuple[bool, str]:
         """Test connection to datasource"""
         try:
-            datasource = self._DataSource.query.get(datasource_id)
-            if not datasource:
-                return False, "DataSource not found"
+            db_type = self.get_pooled(datasource_id).db_type
             
             with self.get_connection(datasource_id) as conn:
-                if datasource.db_type == 'oracle':
-                    result = conn.execute(text("SELECT 'OK' as status FROM DUAL"))
-                else:  # postgres
-                    result = conn.execute(text("SELECT 'OK' as status"))
+                result = conn.execute(STATUS_SQL[db_type])
                 
                 row = result.fetchone()
                 if row and row[0] == 'OK':
@@ -190,96 +448,131 @@ class ConnectionManager:
         Returns:
             Tuple of (is_valid, error_messages)
         """
-        errors = []
-        query_upper = query.strip().upper()
-        
-        if not query.strip():
-            errors.append("Query cannot be empty")
-            return False, errors
-        
-        if query_type == 'extract':
-            # Extract queries should be SELECT only
-            if not query_upper.startswith('SELECT'):
-                errors.append("Extract queries must start with SELECT")
-            
-            # Check for dangerous operations
-            dangerous_ops = ['DROP', 'DELETE', 'INSERT', 'UPDATE', 'CREATE', 'ALTER', 'TRUNCATE', 'EXECUTE']
-            for op in dangerous_ops:
-                if op in query_upper:
-                    errors.append(f"Extract queries cannot contain {op} operations")
-        
-        elif query_type == 'load':
-            # Load queries should be INSERT, UPDATE, MERGE, or UPSERT
-            valid_starts = ['INSERT', 'UPDATE', 'MERGE', 'UPSERT']
-            if not any(query_upper.startswith(op) for op in valid_starts):
-                errors.append("Load queries must start with INSERT, UPDATE, MERGE, or UPSERT")
-            
-            # Check for dangerous operations
-            dangerous_ops = ['DROP', 'CREATE', 'ALTER', 'TRUNCATE', 'EXECUTE']
-            for op in dangerous_ops:
-                if op in query_upper:
-                    errors.append(f"Load queries cannot contain {op} operations")
-        
-        # Check for SQL injection patterns
-        injection_patterns = ['--', '/*', '*/', ';--', 'xp_', 'sp_']
-        for pattern in injection_patterns:
-            if pattern in query.lower():
-                errors.append(f"Query contains potentially unsafe pattern: {pattern}")
-        
-        return len(errors) == 0, errors
+        is_valid, errors = _validate_query(query, query_type)
+        return is_valid, list(errors)
     
     def get_table_info(self, datasource_id: int, table_name: str) -> Dict[str, Any]:
         """Get table structure information"""
-        try:
-            datasource = self._DataSource.query.get(datasource_id)
-            if not datasource:
-                raise ValueError(f"DataSource {datasource_id} not found")
-            
-            if datasource.db_type == 'oracle':
-                query = """
-                SELECT column_name, data_type, nullable, data_default
-                FROM all_tab_columns 
-                WHERE table_name = UPPER(:table_name)
-                AND owner = USER
-                ORDER BY column_id
-                """
-            else:  # postgres
-                query = """
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns 
-                WHERE table_name = LOWER(:table_name)
-                ORDER BY ordinal_position
-                """
-            
-            results, _ = self.execute_query(datasource_id, query, {'table_name': table_name})
+        return self.get_tables_info(datasource_id, [table_name])[table_name]
+    
+    def get_tables_info(self, datasource_id: int, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get structure information for several tables in one round trip
+        
+        Metadata is cached for table_info_ttl seconds; only tables missing from
+        the cache are looked up.
+        
+        Args:
+            datasource_id: DataSource ID
+            table_names: Tables to describe
             
-            return {
+        Returns:
+            Dict of table name -> table info (same shape as get_table_info)
+        """
+        now = time.monotonic()
+        tables = {}
+        missing = []
+        with self._table_info_lock:
+            for table_name in table_names:
+                cached = self._table_info_cache.get((datasource_id, table_name.lower()))
+                if cached and cached[0] > now:
+                    tables[table_name] = cached[1]
+                else:
+                    missing.append(table_name)
+        
+        if not missing:
+            return tables
+        
+        try:
+            fetched = self._fetch_tables_info(datasource_id, missing)
+        except Exception as e:
+            logger.error(f"Failed to get table info for {', '.join(missing)}: {e}")
+            for table_name in missing:
+                tables[table_name] = {'table_name': table_name, 'columns': [], 'error': str(e)}
+            return tables
+        
+        expires_at = now + self.table_info_ttl
+        with self._table_info_lock:
+            for table_name, info in fetched.items():
+                self._table_info_cache[(datasource_id, table_name.lower())] = (expires_at, info)
+        tables.update(fetched)
+        return tables
+    
+    def _fetch_tables_info(self, datasource_id: int, table_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Query the catalog for the columns of several tables"""
+        if self.get_pooled(datasource_id).db_type == 'oracle':
+            lookup = {name.upper(): name for name in table_names}
+            query = """
+            SELECT table_name, column_name, data_type, nullable, data_default
+            FROM all_tab_columns 
+            WHERE table_name IN :names
+            AND owner = USER
+            ORDER BY table_name, column_id
+            """
+        else:  # postgres
+            lookup = {name.lower(): name for name in table_names}
+            query = """
+            SELECT table_name, column_name, data_type, is_nullable, column_default
+            FROM information_schema.columns 
+            WHERE table_name IN :names
+            ORDER BY table_name, ordinal_position
+            """
+        
+        statement = self._statement(query).bindparams(bindparam('names', expanding=True))
+        with self.get_connection(datasource_id) as conn:
+            rows = [dict(row) for row in conn.execute(statement, {'names': list(lookup)}).mappings()]
+        
+        columns_by_table = {}
+        for stored_name, table_rows in groupby(rows, key=itemgetter('table_name')):
+            columns = []
+            for row in table_rows:
+                del row['table_name']
+                columns.append(row)
+            columns_by_table[stored_name] = columns
+        
+        tables = {}
+        for stored_name, table_name in lookup.items():
+            columns = columns_by_table.get(stored_name, [])
+            tables[table_name] = {
                 'table_name': table_name,
-                'columns': results,
-                'column_count': len(results)
+                'columns': columns,
+                'column_count': len(columns)
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to get table info for {table_name}: {e}")
-            return {'table_name': table_name, 'columns': [], 'error': str(e)}
+        return tables
+    
+    def invalidate_table_cache(self, datasource_id: int, table_name: Optional[str] = None):
+        """Forget cached metadata for one table, or for every table of a datasource"""
+        with self._table_info_lock:
+            if table_name is not None:
+                self._table_info_cache.pop((datasource_id, table_name.lower()), None)
+                return
+            for key in [key for key in self._table_info_cache if key[0] == datasource_id]:
+                del self._table_info_cache[key]
     
     def close_all_connections(self):
         """Close all connection pools (cleanup)"""
-        for datasource_id, engine in self._connection_pools.items():
+        # Take the pools out under the lock, then dispose outside it since
+        # dispose() may block on socket shutdown
+        with self._pool_lock:
+            snapshot = list(self._connection_pools.items())
+            self._connection_pools.clear()
+        
+        for datasource_id, pooled in snapshot:
             try:
-                engine.dispose()
+                pooled.engine.dispose()
                 logger.info(f"Closed connection pool for DataSource {datasource_id}")
             except Exception as e:
                 logger.error(f"Error closing connection pool for DataSource {datasource_id}: {e}")
         
-        self._connection_pools.clear()
+        with self._table_info_lock:
+            self._table_info_cache.clear()
     
     def get_connection_stats(self) -> Dict[int, Dict[str, Any]]:
         """Get connection pool statistics"""
         stats = {}
         
-        for datasource_id, engine in self._connection_pools.items():
-            pool = engine.pool
+        for datasource_id, pooled in list(self._connection_pools.items()):
+            pool = pooled.engine.pool
             stats[datasource_id] = {
                 'pool_size': pool.size(),
                 'checked_in': pool.checkedin(),
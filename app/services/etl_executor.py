@@ -383,8 +383,17 @@ class ETLExecutor:
         if not batch_data:
             return 0
         
-        # For now, execute load query for each record
-        # TODO: Implement bulk insert optimization
+        # Send the whole batch in one executemany call
+        try:
+            return connection_manager.execute_many(
+                integration.target_id,
+                integration.load_sql,
+                batch_data
+            )
+        except Exception as e:
+            logger.warning(f"Batch load failed, retrying record by record: {e}")
+        
+        # Fall back to one statement per record so a bad record only skips itself
         loaded_count = 0
         
         for record in batch_data:
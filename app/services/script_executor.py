@@ -2,23 +2,57 @@
 Script Executor Service - Handles safe execution of uploaded scripts
 """
 
+import ctypes
 import os
 import subprocess
 import tempfile
 import threading
 import time
-from datetime import datetime
-from flask import current_app
+from flask import current_app, g
 
 from app.models.execution import Execution, ExecutionStatus, ExecutionTrigger
 from app.models.script import Script
 from app.models import db
 
+# Windows process query constants (winnt.h / winerror.h)
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+ERROR_ACCESS_DENIED = 5
+
+def _process_exists(pid):
+    """
+    Check whether a process with this PID exists without disturbing it
+    
+    On Windows os.kill terminates the process whatever the signal, so the
+    process is opened for query and its exit code read instead.
+    """
+    if os.name == 'nt':
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # Processes of other users exist but cannot be opened
+            return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+        
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    
+    try:
+        os.kill(pid, 0)  # Signal 0 just checks existence
+    except (OSError, ProcessLookupError):
+        return False
+    return True
+
 class ScriptExecutor:
     """Service for executing scripts safely with isolation and monitoring"""
     
     def __init__(self):
         self.running_processes = {}  # pid -> execution_id mapping
+        self.execution_pids = {}  # execution_id -> pid (reverse of running_processes)
         self.max_concurrent = int(os.environ.get('MAX_CONCURRENT_SCRIPTS', 10))
         self.default_timeout = int(os.environ.get('SCRIPT_TIMEOUT', 300))  # 5 minutes
     
@@ -109,7 +143,7 @@ class ScriptExecutor:
                 
                 # Update execution record with PID
                 execution.start_execution(pid=process.pid)
-                self.running_processes[process.pid] = execution_id
+                self._track_process(process.pid, execution_id)
                 
                 try:
                     # Wait for completion with timeout
@@ -134,26 +168,21 @@ class ScriptExecutor:
                 
                 finally:
                     # Clean up process tracking
-                    if process.pid in self.running_processes:
-                        del self.running_processes[process.pid]
+                    self._untrack_process(process.pid)
         
         except Exception as e:
             # Execution failed to start or crashed
             execution.status = ExecutionStatus.FAILED
-            execution.completed_at = datetime.utcnow()
             execution.stderr = str(e)
             execution.exit_code = -1
-            
-            if execution.started_at:
-                execution.duration_seconds = (execution.completed_at - execution.started_at).total_seconds()
+            execution.record_completion()
             
             db.session.commit()
             
             # Clean up if process was registered
-            for pid, exec_id in list(self.running_processes.items()):
-                if exec_id == execution_id:
-                    del self.running_processes[pid]
-                    break
+            pid = self.execution_pids.get(execution_id)
+            if pid is not None:
+                self._untrack_process(pid)
     
     def cancel_execution(self, execution_id):
         """
@@ -163,36 +192,71 @@ class ScriptExecutor:
             execution_id: ID of execution to cancel
             
         Returns:
-            bool: True if cancelled, False if not running or not found
+            bool: True if cancelled, False if not running, not found or
+                  started by another worker
         """
         execution = Execution.query.get(execution_id)
         if not execution or not execution.is_running:
             return False
         
-        # Find and kill process
-        for pid, exec_id in list(self.running_processes.items()):
-            if exec_id == execution_id:
-                try:
-                    # Kill process
-                    if os.name == 'nt':  # Windows
-                        subprocess.run(['taskkill', '/F', '/PID', str(pid)], check=False)
-                    else:  # Unix-like
-                        os.kill(pid, 9)  # SIGKILL
-                    
-                    # Update execution record
-                    execution.cancel_execution()
-                    
-                    # Clean up tracking
-                    del self.running_processes[pid]
-                    return True
-                
-                except (OSError, ProcessLookupError):
-                    # Process already dead
-                    execution.cancel_execution()
-                    del self.running_processes[pid]
-                    return True
+        # Only processes this worker started are signalled; the PID stored on the
+        # row may be on another host or already reused by an unrelated process.
+        # The row is left RUNNING for its owner to finish or the startup sweep to fail.
+        pid = self.execution_pids.get(execution_id)
+        if pid is None:
+            return False
         
-        return False
+        try:
+            # Kill process
+            if os.name == 'nt':  # Windows
+                subprocess.run(['taskkill', '/F', '/PID', str(pid)], check=False)
+            else:  # Unix-like
+                os.kill(pid, 9)  # SIGKILL
+            
+            # Update execution record
+            execution.cancel_execution()
+            
+            # Clean up tracking
+            self._untrack_process(pid)
+            return True
+        
+        except (OSError, ProcessLookupError):
+            # Process already dead
+            execution.cancel_execution()
+            self._untrack_process(pid)
+            return True
+    
+    def _track_process(self, pid, execution_id):
+        """Register a running process in both lookup maps"""
+        self.running_processes[pid] = execution_id
+        self.execution_pids[execution_id] = pid
+    
+    def _untrack_process(self, pid):
+        """Remove a process from both lookup maps if present"""
+        execution_id = self.running_processes.pop(pid, None)
+        if execution_id is not None:
+            self.execution_pids.pop(execution_id, None)
+    
+    def is_running(self, execution_id, status=None):
+        """
+        Check whether an execution is running in any worker process
+        
+        Processes started by this worker are answered from the in-memory map;
+        otherwise the execution row, which every worker writes to, decides.
+        Pass the row's status when the caller already loaded it to skip the query.
+        """
+        if execution_id in self.execution_pids:
+            return True
+        
+        if status is None:
+            return db.session.query(
+                Execution.query.filter(
+                    Execution.id == execution_id,
+                    Execution.status == ExecutionStatus.RUNNING
+                ).exists()
+            ).scalar()
+        
+        return status == ExecutionStatus.RUNNING
     
     def get_running_executions(self):
         """
@@ -206,10 +270,7 @@ class ScriptExecutor:
     def cleanup_stale_processes(self):
         """Clean up any stale process tracking (for system restart recovery)"""
         for pid in list(self.running_processes.keys()):
-            try:
-                # Check if process still exists
-                os.kill(pid, 0)  # Signal 0 just checks existence
-            except (OSError, ProcessLookupError):
+            if not _process_exists(pid):
                 # Process is dead, clean up
                 execution_id = self.running_processes[pid]
                 execution = Execution.query.get(execution_id)
@@ -217,16 +278,47 @@ class ScriptExecutor:
                 if execution and execution.is_running:
                     # Mark as failed due to system restart
                     execution.status = ExecutionStatus.FAILED
-                    execution.completed_at = datetime.utcnow()
                     execution.stderr = "Execution interrupted by system restart"
                     execution.exit_code = -3
-                    
-                    if execution.started_at:
-                        execution.duration_seconds = (execution.completed_at - execution.started_at).total_seconds()
+                    execution.record_completion()
                     
                     db.session.commit()
                 
-                del self.running_processes[pid]
+                self._untrack_process(pid)
+    
+    def sweep_orphaned_executions(self):
+        """
+        Fail executions left RUNNING by a worker that died without finishing them
+        
+        Run at startup. Liveness is checked on the stored PID without signalling
+        it, so workers must share this host; a reused PID only keeps the row RUNNING.
+        
+        Returns:
+            int: Number of executions marked as failed
+        """
+        swept = 0
+        for execution in Execution.query.filter(Execution.status == ExecutionStatus.RUNNING).all():
+            if execution.id in self.execution_pids:
+                continue
+            
+            if execution.pid and _process_exists(execution.pid):
+                continue  # Still alive in another worker
+            
+            execution.status = ExecutionStatus.FAILED
+            execution.stderr = (execution.stderr or '') + "\n\nExecution interrupted: worker process exited"
+            execution.exit_code = -3
+            execution.record_completion()
+            swept += 1
+        
+        if swept:
+            db.session.commit()
+        return swept
 
 # Global executor instance
-script_executor = ScriptExecutor()
\ No newline at end of file
+script_executor = ScriptExecutor()
+
+def running_execution_ids():
+    """Running execution IDs, snapshotted once per request as a frozenset"""
+    if 'running_execution_ids' not in g:
+        g.running_execution_ids = frozenset(script_executor.get_running_executions())
+    return g.running_execution_ids
@@ -74,6 +74,8 @@ function startLogPolling(executionId) {
     var pollInterval = 2000; // 2 seconds
     var maxPolls = 300; // 10 minutes max
     var pollCount = 0;
+    var stdoutOffset = 0;
+    var stderrOffset = 0;
     
     function pollLogs() {
         if (pollCount >= maxPolls) {
@@ -81,7 +83,8 @@ function startLogPolling(executionId) {
             return;
         }
         
-        fetch('/logs/execution/' + executionId + '/output')
+        fetch('/logs/execution/' + executionId + '/output?since=' + stdoutOffset +
+              '&since_stderr=' + stderrOffset)
             .then(response => response.json())
             .then(data => {
                 pollCount++;
@@ -102,18 +105,21 @@ function startLogPolling(executionId) {
                     durationElement.textContent = data.duration;
                 }
                 
-                // Update output
+                // Append new output since the last poll
                 var stdoutElement = document.getElementById('execution-stdout');
                 if (stdoutElement && data.stdout) {
-                    stdoutElement.textContent = data.stdout;
+                    stdoutElement.textContent = (stdoutOffset ? stdoutElement.textContent : '') + data.stdout;
                 }
                 
                 var stderrElement = document.getElementById('execution-stderr');
                 if (stderrElement && data.stderr) {
-                    stderrElement.textContent = data.stderr;
-                    stderrElement.parentElement.style.display = data.stderr ? 'block' : 'none';
+                    stderrElement.textContent = (stderrOffset ? stderrElement.textContent : '') + data.stderr;
+                    stderrElement.parentElement.style.display = 'block';
                 }
                 
+                stdoutOffset = data.next_offset || 0;
+                stderrOffset = data.next_stderr_offset || 0;
+                
                 // Update cancel button
                 var cancelButton = document.getElementById('cancel-execution-btn');
                 if (cancelButton) {
@@ -124,8 +130,11 @@ function startLogPolling(executionId) {
                     }
                 }
                 
-                // Continue polling if still running
-                if (data.is_running) {
+                // Fetch the rest of a large backlog right away, otherwise
+                // continue polling if still running
+                if (data.has_more) {
+                    pollLogs();
+                } else if (data.is_running) {
                     setTimeout(pollLogs, pollInterval);
                 } else {
                     console.log('Log polling stopped: execution finished');
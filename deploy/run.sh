@@ -36,6 +36,10 @@ if [ ! -f "scriptflow.db" ]; then
     python -c "from app_simple import app, db; app.app_context().push(); db.create_all()"
 fi
 
+# Upgrade the schema, catch up schedules and fail orphaned executions before the app starts
+echo "🔧 Preparing database..."
+python -c "from app_simple import app; from app import prepare_database; app.app_context().push(); prepare_database()"
+
 # Check if admin user exists
 admin_exists=$(python -c "
 from app_simple import app, User
@@ -31,6 +31,14 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 10 * 1024 * 1024  # 10MB max file size
 
+# Let a front-end server (Apache mod_xsendfile, lighttpd) stream file downloads
+# from disk instead of the Python process
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+
+# JSON responses keep insertion order instead of sorting every dict's keys,
+# which matters for the large payloads of the output polling endpoints
+app.json.sort_keys = False
+
 # Python interpreter configuration
 app.config['PYTHON_EXECUTABLE'] = os.environ.get('PYTHON_EXECUTABLE', 'python3')
 app.config['PYTHON_ENV'] = os.environ.get('PYTHON_ENV', None)
@@ -1022,6 +1030,12 @@ def register_blueprints():
     
     print("✅ All blueprints registered successfully (including Integration feature)")
 
+def warm_datasource_pools():
+    """Pre-open connection pools for active datasources so the first ETL jobs skip the handshakes"""
+    from app.services.connection_manager import connection_manager
+    with app.app_context():
+        connection_manager.warm_all()
+
 # Root route
 @app.route('/')
 def index():
@@ -1067,6 +1081,9 @@ if __name__ == '__main__':
     # Register blueprints
     register_blueprints()
     
+    # Open the Integration datasource connection pools in the background
+    threading.Thread(target=warm_datasource_pools, daemon=True).start()
+    
     # Find free port and start
     port = find_free_port()
     print(f"\n🚀 ScriptFlow (Modular) starting on http://localhost:{port}")
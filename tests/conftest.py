@@ -0,0 +1,56 @@
+"""
+Test fixtures - a throwaway Flask app wired to the app.models package
+"""
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+
+import app.models
+
+flask_app = Flask(__name__)
+flask_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+flask_app.config['SECRET_KEY'] = 'test'
+flask_app.config['TESTING'] = True
+
+# The models read db from their package, so it must be set before they are imported
+db = SQLAlchemy(flask_app)
+app.models.db = db
+
+from app.models.user import User
+from app.models.script import Script
+import app.models.execution
+from app.models.execution import Execution
+from app.models.schedule import Schedule
+
+# schedules.integration_id references the integrations table defined in scriptflow.py
+db.Table('integrations', db.Column('id', db.Integer, primary_key=True))
+
+@pytest.fixture
+def session():
+    """Fresh in-memory database for each test"""
+    with flask_app.app_context():
+        db.create_all()
+        yield db.session
+        db.session.remove()
+        db.drop_all()
+        
+        # The output search mirror is created outside the metadata
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS executions_fts"))
+        app.models.execution._search_index_available = None
+
+@pytest.fixture
+def user(session):
+    user = User('tester', 'tester@example.com', 'secret')
+    session.add(user)
+    session.commit()
+    return user
+
+@pytest.fixture
+def script(session, user):
+    script = Script('Test script', '', 'test.py', '/tmp/test.py', 'py', user.id)
+    session.add(script)
+    session.commit()
+    return script
@@ -0,0 +1,53 @@
+"""
+User.active_schedule_count maintained by the Schedule mapper events
+"""
+
+from tests.conftest import Schedule, User
+from app.models.schedule import ScheduleFrequency
+
+def active_count(session, user):
+    return session.query(User.active_schedule_count).filter(User.id == user.id).scalar()
+
+def create_schedule(session, script):
+    schedule = Schedule('Nightly', ScheduleFrequency.DAILY, {'time': '02:00'}, script_id=script.id)
+    session.add(schedule)
+    session.commit()
+    return schedule
+
+def test_toggling_a_committed_schedule(session, user, script):
+    schedule = create_schedule(session, script)
+    assert active_count(session, user) == 1
+    
+    schedule.toggle_active()
+    assert active_count(session, user) == 0
+    
+    schedule.toggle_active()
+    assert active_count(session, user) == 1
+
+def test_deactivating_an_expired_schedule(session, user, script):
+    schedule = create_schedule(session, script)
+    session.expire_all()
+    
+    schedule.is_active = False
+    session.commit()
+    assert active_count(session, user) == 0
+    
+    schedule.is_active = True
+    session.commit()
+    assert active_count(session, user) == 1
+
+def test_bulk_deactivation_adjusts_the_counter(session, user, script):
+    create_schedule(session, script)
+    
+    assert Schedule.deactivate_for_script(script.id) == 1
+    session.commit()
+    assert active_count(session, user) == 0
+
+def test_counter_matches_sync(session, user, script):
+    schedule = create_schedule(session, script)
+    schedule.toggle_active()
+    schedule.toggle_active()
+    before = active_count(session, user)
+    
+    User.sync_active_schedule_counts()
+    assert active_count(session, user) == before == 1
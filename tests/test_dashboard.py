@@ -0,0 +1,40 @@
+"""
+Dashboard per-script summaries
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+from tests.conftest import Execution, Script
+from app.models.execution import ExecutionStatus
+from app.routes.dashboard import get_script_summaries
+
+def add_execution(session, script, started_at, status, exit_code):
+    execution = Execution(script.id, script.user_id)
+    execution.started_at = started_at
+    execution.status = status
+    execution.exit_code = exit_code
+    execution.stdout = 'x' * 1000
+    session.add(execution)
+    session.commit()
+    return execution
+
+def test_summaries_use_the_latest_execution_and_counters(session, user, script):
+    idle_script = Script('Idle', '', 'idle.py', '/tmp/idle.py', 'py', user.id)
+    session.add(idle_script)
+    now = datetime.utcnow()
+    add_execution(session, script, now - timedelta(hours=2), ExecutionStatus.COMPLETED, 0)
+    latest = add_execution(session, script, now - timedelta(hours=1), ExecutionStatus.FAILED, 1)
+    add_execution(session, script, now - timedelta(hours=3), ExecutionStatus.COMPLETED, 0)
+    user_id, script_id, latest_id = user.id, script.id, latest.id
+    session.expunge_all()
+    
+    summaries = get_script_summaries(user_id, [])
+    
+    assert set(summaries) == {script_id}
+    summary = summaries[script_id]
+    assert (summary['total'], summary['successful'], summary['success_rate']) == (3, 2, 66.7)
+    assert summary['last_execution'].id == latest_id
+    assert summary['last_execution'].status == ExecutionStatus.FAILED
+    assert 'stdout' in inspect(summary['last_execution']).unloaded
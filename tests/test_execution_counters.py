@@ -0,0 +1,46 @@
+"""
+Script execution counters maintained by the Execution mapper events
+"""
+
+from tests.conftest import Execution, Script
+
+def counters(session, script):
+    return session.query(Script.executions_total, Script.executions_successful)\
+        .filter(Script.id == script.id).one()
+
+def run_execution(session, script, exit_code):
+    """Create, start and complete an execution the way the executor does"""
+    execution = Execution(script.id, script.user_id)
+    session.add(execution)
+    session.commit()
+    
+    execution.start_execution(pid=1234)  # commits, expiring the instance
+    execution.complete_execution(exit_code, 'out', '')
+    return execution
+
+def test_successful_runs_are_counted(session, script):
+    run_execution(session, script, 0)
+    assert counters(session, script) == (1, 1)
+    
+    run_execution(session, script, 0)
+    assert counters(session, script) == (2, 2)
+
+def test_failed_runs_count_only_towards_total(session, script):
+    run_execution(session, script, 0)
+    run_execution(session, script, 1)
+    assert counters(session, script) == (2, 1)
+
+def test_counters_match_sync(session, script):
+    run_execution(session, script, 0)
+    execution = run_execution(session, script, 0)
+    execution.cancel_execution()  # a successful run turned into a cancelled one
+    before = counters(session, script)
+    
+    Script.sync_execution_counters()
+    assert counters(session, script) == before == (2, 1)
+
+def test_deleting_a_successful_run_decrements_both(session, script):
+    execution = run_execution(session, script, 0)
+    session.delete(execution)
+    session.commit()
+    assert counters(session, script) == (0, 0)
@@ -0,0 +1,26 @@
+"""
+Execution status and duration helpers shared by the model and the output endpoint
+"""
+
+import pytest
+
+from tests.conftest import Execution
+from app.models.execution import ExecutionStatus, format_duration
+
+@pytest.mark.parametrize('status', list(ExecutionStatus))
+def test_model_and_status_agree_on_finished(session, script, status):
+    execution = Execution(script.id, script.user_id)
+    execution.status = status
+    
+    assert execution.is_finished == status.is_finished
+    assert status.is_finished == (status not in (ExecutionStatus.PENDING, ExecutionStatus.RUNNING))
+
+@pytest.mark.parametrize('seconds, expected', [
+    (None, 'N/A'),
+    (0, 'N/A'),
+    (4.25, '4.2s'),
+    (125, '2m 5s'),
+    (7380, '2h 3m'),
+])
+def test_format_duration(seconds, expected):
+    assert format_duration(seconds) == expected
@@ -0,0 +1,116 @@
+"""
+Schema upgrades for databases created by older versions
+"""
+
+import hashlib
+from sqlalchemy import inspect, text
+
+from tests.conftest import Execution, Schedule, Script, User, db
+from app.models.execution import ExecutionStatus
+from app.models.migrations import upgrade_database
+from app.models.schedule import ScheduleFrequency
+
+SCHEDULE_CONFIG_COLUMNS = ('target_hour', 'target_minute', 'weekday_mask',
+                           'month_day', 'interval_minutes', 'start_date')
+
+def drop_columns(table, columns):
+    with db.engine.begin() as connection:
+        for column in columns:
+            connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+
+def column_names(table):
+    return {column['name'] for column in inspect(db.engine).get_columns(table)}
+
+def test_upgrade_adds_and_backfills_schedule_config_columns(session, script):
+    schedule = Schedule('Weekly', ScheduleFrequency.WEEKLY,
+                        {'time': '06:30', 'days': ['Monday', 'Friday']}, script_id=script.id)
+    session.add(schedule)
+    session.commit()
+    schedule_id = schedule.id
+    session.close()
+    drop_columns('schedules', SCHEDULE_CONFIG_COLUMNS)
+    
+    upgrade_database()
+    
+    assert column_names('schedules') >= set(SCHEDULE_CONFIG_COLUMNS)
+    schedule = session.get(Schedule, schedule_id)
+    assert (schedule.target_hour, schedule.target_minute, schedule.weekday_mask) == (6, 30, 0b10001)
+
+def test_upgrade_is_a_no_op_on_a_current_database(session):
+    upgrade_database()
+    upgrade_database()
+
+def index_names(table):
+    return {index['name'] for index in inspect(db.engine).get_indexes(table)}
+
+def test_upgrade_creates_missing_indexes(session):
+    with db.engine.begin() as connection:
+        for index in ('ix_exec_script_started_dur', 'ix_schedules_active_script', 'ix_scripts_active_user_size'):
+            connection.execute(text(f"DROP INDEX {index}"))
+    
+    upgrade_database()
+    
+    assert 'ix_exec_script_started_dur' in index_names('executions')
+    assert 'ix_schedules_active_script' in index_names('schedules')
+    assert 'ix_scripts_active_user_size' in index_names('scripts')
+
+def test_upgrade_builds_the_output_search_index(session, script):
+    execution = Execution(script.id, script.user_id)
+    execution.stdout = 'row count mismatch in nightly export'
+    session.add(execution)
+    session.commit()
+    
+    assert not Execution.search_indexes_exist()
+    upgrade_database()
+    assert Execution.search_indexes_exist()
+    
+    matches = Execution.query.filter(Execution.output_search_filter('mismatch')).all()
+    assert [match.id for match in matches] == [execution.id]
+
+def test_upgrade_backfills_counters_and_hashes(session, tmp_path, user, script):
+    script_file = tmp_path / 'test.py'
+    script_file.write_bytes(b"print('hello')\n")
+    script.file_path = str(script_file)
+    
+    execution = Execution(script.id, user.id)
+    execution.status = ExecutionStatus.COMPLETED
+    execution.exit_code = 0
+    schedule = Schedule('Nightly', ScheduleFrequency.DAILY, {'time': '02:00'}, script_id=script.id)
+    session.add_all([execution, schedule])
+    session.commit()
+    user_id, script_id = user.id, script.id
+    session.close()
+    
+    drop_columns('scripts', ('executions_total', 'executions_successful', 'content_sha256'))
+    drop_columns('users', ('active_schedule_count',))
+    
+    upgrade_database()
+    
+    script = session.get(Script, script_id)
+    assert (script.executions_total, script.executions_successful) == (1, 1)
+    assert script.content_sha256 == hashlib.sha256(b"print('hello')\n").hexdigest()
+    assert session.get(User, user_id).active_schedule_count == 1
+
+def test_registering_the_dashboard_leaves_the_database_alone(session):
+    from flask import Flask
+    from app.routes.dashboard import dashboard_bp
+    
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_schedules_active_script"))
+    
+    Flask(__name__).register_blueprint(dashboard_bp)
+    
+    assert 'ix_schedules_active_script' not in index_names('schedules')
+
+def test_prepare_database_upgrades_and_sweeps(session, script):
+    from app import prepare_database
+    
+    execution = Execution(script.id, script.user_id)
+    session.add(execution)
+    session.commit()
+    execution.start_execution(pid=None)
+    
+    prepare_database()
+    
+    assert Execution.search_indexes_exist()
+    assert execution.status == ExecutionStatus.FAILED
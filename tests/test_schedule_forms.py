@@ -0,0 +1,18 @@
+"""
+Schedule form parsing helpers
+"""
+
+import pytest
+
+from app.routes.schedules import parse_notification_emails
+
+def test_accepts_single_label_hosts():
+    assert parse_notification_emails(' ops@localhost , team@example.com ') == ['ops@localhost', 'team@example.com']
+
+def test_skips_empty_entries():
+    assert parse_notification_emails('a@mailhost,, ') == ['a@mailhost']
+
+@pytest.mark.parametrize('value', ['no-at-sign', 'two@@example.com', 'user@', '@example.com', 'a b@example.com'])
+def test_rejects_malformed_addresses(value):
+    with pytest.raises(ValueError):
+        parse_notification_emails(value)
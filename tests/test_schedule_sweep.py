@@ -0,0 +1,31 @@
+"""
+Batch next_execution recomputation for active schedules
+"""
+
+from datetime import datetime, timedelta
+
+from tests.conftest import Schedule, Script
+from app.models.schedule import ScheduleFrequency
+
+def test_recompute_refreshes_stale_next_executions(session, user, script):
+    other_script = Script('Other script', '', 'other.py', '/tmp/other.py', 'py', user.id)
+    session.add(other_script)
+    session.commit()
+    
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).date().isoformat()
+    schedules = [
+        Schedule('Interval', ScheduleFrequency.INTERVAL,
+                 {'interval_minutes': 45, 'time': '00:00', 'start_date': tomorrow}, script_id=script.id),
+        Schedule('Daily', ScheduleFrequency.DAILY, {'time': '02:00'}, script_id=other_script.id),
+    ]
+    for schedule in schedules:
+        schedule.next_execution = datetime(2000, 1, 1)  # Stale, as after downtime
+    session.add_all(schedules)
+    session.commit()
+    
+    assert Schedule.recompute_all_next_executions() == 2
+    
+    for schedule in schedules:
+        session.refresh(schedule)
+        assert schedule.next_execution == schedule.calculate_next_execution()
+        assert schedule.next_execution > datetime.utcnow()
@@ -0,0 +1,95 @@
+"""
+Cancelling and sweeping executions in the script executor
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import Execution
+from app.models.execution import ExecutionStatus
+from app.services import script_executor
+from app.services.script_executor import ScriptExecutor
+
+@pytest.fixture
+def sleeper():
+    """A live process that no executor started"""
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    yield process
+    process.kill()
+    process.wait()
+
+def running_execution(session, script, pid):
+    execution = Execution(script.id, script.user_id)
+    session.add(execution)
+    session.commit()
+    execution.start_execution(pid=pid)
+    return execution
+
+def test_cancel_does_not_signal_untracked_pids(session, script, sleeper):
+    execution = running_execution(session, script, sleeper.pid)
+    
+    assert not ScriptExecutor().cancel_execution(execution.id)
+    
+    assert sleeper.poll() is None  # Still alive
+    session.expire_all()
+    assert execution.status == ExecutionStatus.RUNNING
+
+def test_cancel_kills_tracked_processes(session, script, sleeper):
+    executor = ScriptExecutor()
+    execution = running_execution(session, script, sleeper.pid)
+    executor._track_process(sleeper.pid, execution.id)
+    
+    assert executor.cancel_execution(execution.id)
+    
+    assert sleeper.wait(timeout=5) is not None
+    assert execution.status == ExecutionStatus.CANCELLED
+    assert execution.id not in executor.execution_pids
+
+def test_sweep_fails_only_orphaned_executions(session, script, sleeper):
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()
+    orphaned = running_execution(session, script, finished.pid)
+    alive = running_execution(session, script, sleeper.pid)
+    
+    assert ScriptExecutor().sweep_orphaned_executions() == 1
+    
+    assert orphaned.status == ExecutionStatus.FAILED
+    assert alive.status == ExecutionStatus.RUNNING
+
+class FakeKernel32:
+    """kernel32 stand-in reporting one live process"""
+    
+    def __init__(self, live_pid):
+        self.live_pid = live_pid
+        self.closed = []
+    
+    def OpenProcess(self, access, inherit, pid):
+        return pid if pid == self.live_pid else 0
+    
+    def GetExitCodeProcess(self, handle, exit_code):
+        exit_code._obj.value = script_executor.STILL_ACTIVE
+        return 1
+    
+    def CloseHandle(self, handle):
+        self.closed.append(handle)
+
+def test_sweep_never_signals_processes_on_windows(session, script, monkeypatch):
+    kernel32 = FakeKernel32(live_pid=4242)
+    monkeypatch.setattr(script_executor.os, 'name', 'nt')
+    monkeypatch.setattr(script_executor.ctypes, 'WinDLL', lambda name, use_last_error: kernel32, raising=False)
+    monkeypatch.setattr(script_executor.ctypes, 'get_last_error', lambda: 87, raising=False)  # ERROR_INVALID_PARAMETER
+    
+    def kill(pid, sig):
+        raise AssertionError("os.kill terminates processes on Windows")
+    monkeypatch.setattr(script_executor.os, 'kill', kill)
+    
+    orphaned = running_execution(session, script, 4343)
+    alive = running_execution(session, script, 4242)
+    
+    assert ScriptExecutor().sweep_orphaned_executions() == 1
+    
+    assert orphaned.status == ExecutionStatus.FAILED
+    assert alive.status == ExecutionStatus.RUNNING
+    assert kernel32.closed == [4242]
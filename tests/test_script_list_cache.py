@@ -0,0 +1,46 @@
+"""
+Per-user scripts list cache
+"""
+
+import pytest
+
+from app.routes import scripts
+from app.routes.scripts import list_scripts
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    scripts._script_list_cache.clear()
+    yield
+    scripts._script_list_cache.clear()
+
+def test_searches_are_not_cached(session, script):
+    for search in ('t', 'te', 'tes', 'test'):
+        assert [item.id for item in list_scripts(script.user_id, search, '', '', '', 'updated')] == [script.id]
+    
+    assert script.user_id not in scripts._script_list_cache
+
+def test_filter_combinations_are_capped_per_user(session, script, monkeypatch):
+    monkeypatch.setattr(scripts, 'SCRIPT_LIST_CACHE_PER_USER', 2)
+    
+    for sort_by in ('updated', 'name', 'size'):
+        list_scripts(script.user_id, '', '', '', '', sort_by)
+    
+    assert list(scripts._script_list_cache[script.user_id]) == [('', '', '', 'name'), ('', '', '', 'size')]
+
+def test_users_are_capped(session, script, monkeypatch):
+    monkeypatch.setattr(scripts, 'SCRIPT_LIST_CACHE_USERS', 2)
+    
+    for user_id in (script.user_id, 1001, 1002):
+        list_scripts(user_id, '', '', '', '', 'updated')
+    
+    assert list(scripts._script_list_cache) == [1001, 1002]
+
+def test_expired_entries_are_dropped_on_write(session, script):
+    list_scripts(script.user_id, '', '', '', '', 'updated')
+    user_cache = scripts._script_list_cache[script.user_id]
+    key = ('', '', '', 'updated')
+    user_cache[key] = (0, user_cache[key][1])  # Already expired
+    
+    list_scripts(script.user_id, '', '', '', '', 'name')
+    
+    assert list(scripts._script_list_cache[script.user_id]) == [('', '', '', 'name')]